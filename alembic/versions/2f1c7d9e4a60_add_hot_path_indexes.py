@@ -0,0 +1,67 @@
+"""add hot path indexes
+
+Revision ID: 2f1c7d9e4a60
+Revises: b6890ce3ef42
+Create Date: 2026-10-17 10:41:07.532894
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2f1c7d9e4a60"
+down_revision: Union[str, None] = "b6890ce3ef42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_wallet_id",
+            "transactions",
+            ["wallet_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_wallets_user_id",
+            "wallets",
+            ["user_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_transactions_scheduled_active_frequency",
+            "transactions_scheduled",
+            ["frequency_id", "date_start", "date_end"],
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_transactions_scheduled_active_frequency",
+            table_name="transactions_scheduled",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_wallets_user_id",
+            table_name="wallets",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_transactions_wallet_id",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,82 @@
+"""add next_run_at to scheduled transactions
+
+Revision ID: 5e8b1d4f7a23
+Revises: 7c4e2a91d5b3
+Create Date: 2026-10-17 14:22:31.904118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8b1d4f7a23"
+down_revision: Union[str, None] = "7c4e2a91d5b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "transactions_scheduled",
+        sa.Column("next_run_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE transactions_scheduled AS scheduled
+        SET next_run_at = GREATEST(
+            scheduled.date_start,
+            (
+                SELECT date_trunc('day', max(information.date))
+                FROM transactions
+                JOIN transactions_information AS information
+                    ON information.id = transactions.information_id
+                WHERE transactions.scheduled_transaction_id = scheduled.id
+            )
+            + CASE scheduled.frequency_id
+                WHEN 2 THEN interval '1 day'
+                WHEN 3 THEN interval '7 days'
+                WHEN 4 THEN interval '1 month'
+                WHEN 5 THEN interval '1 year'
+            END
+        )
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_scheduled_next_run_at",
+            "transactions_scheduled",
+            ["is_active", "next_run_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_transactions_scheduled_active_frequency",
+            table_name="transactions_scheduled",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_scheduled_active_frequency",
+            "transactions_scheduled",
+            ["frequency_id", "date_start", "date_end"],
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_transactions_scheduled_next_run_at",
+            table_name="transactions_scheduled",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    op.drop_column("transactions_scheduled", "next_run_at")
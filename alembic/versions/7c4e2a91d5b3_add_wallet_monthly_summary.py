@@ -0,0 +1,88 @@
+"""add wallet monthly summary
+
+Revision ID: 7c4e2a91d5b3
+Revises: 2f1c7d9e4a60
+Create Date: 2026-10-17 12:03:55.184206
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4e2a91d5b3"
+down_revision: Union[str, None] = "2f1c7d9e4a60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "wallet_monthly_summary",
+        sa.Column("wallet_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "income",
+            sa.DECIMAL(precision=12, scale=2),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+        sa.Column(
+            "expense",
+            sa.DECIMAL(precision=12, scale=2),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+        sa.Column("count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["category_id"],
+            ["transactions_category.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["wallet_id"], ["wallets.id"], onupdate="CASCADE", ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "wallet_id", "month", "category_id", name="uq_wallet_monthly_summary"
+        ),
+    )
+
+    op.execute("""
+        INSERT INTO wallet_monthly_summary
+            (wallet_id, month, category_id, income, expense, count)
+        SELECT
+            transactions.wallet_id,
+            date_trunc('month', timezone('UTC', transactions_information.date))::date,
+            transactions_information.category_id,
+            sum(CASE WHEN transactions_information.amount >= 0
+                THEN transactions_information.amount ELSE 0 END),
+            sum(CASE WHEN transactions_information.amount < 0
+                THEN transactions_information.amount ELSE 0 END),
+            count(transactions.id)
+        FROM transactions
+        JOIN transactions_information
+            ON transactions_information.id = transactions.information_id
+        WHERE transactions_information.category_id IS NOT NULL
+        GROUP BY 1, 2, 3
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table("wallet_monthly_summary")
@@ -0,0 +1,51 @@
+"""add transaction pagination indexes
+
+Revision ID: b6890ce3ef42
+Revises: 9694a1dffec2
+Create Date: 2026-10-17 09:12:41.208311
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6890ce3ef42"
+down_revision: Union[str, None] = "9694a1dffec2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_information_date_id",
+            "transactions_information",
+            ["date", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_transactions_information_id",
+            "transactions",
+            ["information_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_transactions_information_id",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_transactions_information_date_id",
+            table_name="transactions_information",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -1,19 +1,115 @@
 import asyncio
+import threading
 from inspect import isawaitable
+from typing import Any, Awaitable, Callable, Coroutine, Optional
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 
 from app.config import settings
+from app.database import dispose_engines, reset_engine_pools
+from app.utils.query_stats import track_queries
 
 
 class AsyncCelery(Celery):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._task_semaphore: Optional[asyncio.Semaphore] = None
         self.patch_task()
 
         if "app" in kwargs:
             self.init_app(kwargs["app"])
 
+    def start_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Starts the event loop of the current process, once.
+
+        The loop runs in a background thread for the lifetime of the
+        process, so the connections of the engine stay bound to it across
+        tasks. With a thread based worker pool, the tasks of all threads run
+        concurrently on this loop, bounded by settings.worker_async_concurrency.
+
+        Returns:
+            asyncio.AbstractEventLoop: The running event loop.
+        """
+
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="async-celery-loop", daemon=True
+                )
+                thread.start()
+
+                self._task_semaphore = asyncio.Semaphore(
+                    settings.worker_async_concurrency
+                )
+                self._loop = loop
+                self._loop_thread = thread
+
+            return self._loop
+
+    def reset_loop(self) -> None:
+        """
+        Forgets the event loop inherited from a parent process.
+
+        The thread running the loop does not exist in a forked process, so
+        the loop is dropped without being closed.
+
+        Returns:
+            None
+        """
+
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        self._task_semaphore = None
+
+    def stop_loop(self, cleanup: Optional[Callable[[], Awaitable[Any]]] = None) -> None:
+        """
+        Stops and closes the event loop of the current process.
+
+        Args:
+            cleanup: Optional coroutine function awaited on the loop before
+                it is stopped.
+
+        Returns:
+            None
+        """
+
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            if loop is None or thread is None:
+                return
+
+            if cleanup is not None:
+                asyncio.run_coroutine_threadsafe(cleanup(), loop).result()
+
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+            self._loop = None
+            self._loop_thread = None
+            self._task_semaphore = None
+
+    def run_coroutine(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        """
+        Runs a coroutine on the event loop of the current process.
+
+        Args:
+            coroutine: The coroutine to run.
+
+        Returns:
+            The result of the coroutine.
+        """
+
+        loop = self.start_loop()
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
     def patch_task(self):
         """
         Patches the task to run asynchronously.
@@ -22,19 +118,26 @@ class AsyncCelery(Celery):
             None
         """
         TaskBase = self.Task
+        async_celery = self
 
         class ContextTask(TaskBase):
             abstract = True
 
             async def _run(self, *args, **kwargs):
-                result = TaskBase.__call__(  # pylint: disable=assignment-from-no-return
-                    self, *args, **kwargs
-                )
-                if isawaitable(result):
-                    await result
+                async with async_celery._task_semaphore:
+                    with track_queries(f"task {self.name}") as query_stats:
+                        # pylint: disable-next=assignment-from-no-return
+                        result = TaskBase.__call__(self, *args, **kwargs)
+                        if isawaitable(result):
+                            result = await result
+
+                if settings.query_stats_enabled:
+                    query_stats.log()
+
+                return result
 
             def __call__(self, *args, **kwargs):
-                asyncio.get_event_loop().run_until_complete(self._run(*args, **kwargs))
+                return async_celery.run_coroutine(self._run(*args, **kwargs))
 
         self.Task = (  # pylint: disable=invalid-name,assignment-from-no-return
             ContextTask
@@ -73,3 +176,26 @@ celery = AsyncCelery(
 )
 
 celery.config_from_object(settings, namespace="celery")
+
+
+def init_worker_process(**_kwargs) -> None:
+    """
+    Gives a forked worker process its own event loop and database connections.
+    """
+
+    celery.reset_loop()
+    reset_engine_pools()
+    celery.start_loop()
+
+
+def shutdown_worker_process(**_kwargs) -> None:
+    """
+    Closes the database connections and the event loop of a worker process.
+    """
+
+    celery.stop_loop(dispose_engines)
+
+
+worker_process_init.connect(init_worker_process)
+worker_process_shutdown.connect(shutdown_worker_process)
+worker_shutdown.connect(shutdown_worker_process)
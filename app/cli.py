@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+from typing import Optional, Sequence
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.config import settings
+from app.database import SessionLocal, create_scheduler_lock_engine, engine
+from app.date_manager import get_today
+from app.repository import Repository
+from app.scheduled_tasks import run_scheduler_as_leader
+from app.tasks import catch_up_missed_scheduled_transactions
+
+
+async def rebuild_monthly_summary(wallet_id: Optional[int] = None) -> None:
+    """
+    Recalculates the monthly wallet summaries from the stored transactions.
+
+    Args:
+        wallet_id: Optional ID of the only wallet to rebuild.
+    """
+
+    try:
+        async with SessionLocal.begin() as session:
+            await Repository(session).rebuild_monthly_summary(wallet_id)
+    finally:
+        await engine.dispose()
+
+
+async def catch_up_scheduled_transactions() -> None:
+    """
+    Creates all runs of scheduled transactions missed up to today.
+    """
+
+    try:
+        created = await catch_up_missed_scheduled_transactions(get_today())
+        print(f"Created {created} scheduled transactions")
+    finally:
+        await engine.dispose()
+
+
+async def run_scheduler() -> None:
+    """
+    Runs the scheduled jobs outside of the web process until interrupted.
+
+    The process campaigns for the leadership like the web workers do, so
+    several schedulers can run side by side for failover.
+    """
+
+    scheduler = AsyncIOScheduler()
+    lock_engine = create_scheduler_lock_engine(settings)
+
+    try:
+        await run_scheduler_as_leader(scheduler, lock_engine)
+    finally:
+        if scheduler.running:
+            scheduler.shutdown()
+        await lock_engine.dispose()
+        await engine.dispose()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Runs a maintenance command.
+
+    Args:
+        argv: The command line arguments, defaults to sys.argv.
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-monthly-summary",
+        help="Recalculate the monthly wallet summaries from the transactions.",
+    )
+    rebuild_parser.add_argument("--wallet-id", type=int, default=None)
+
+    subparsers.add_parser(
+        "run-scheduler",
+        help="Run the scheduled jobs as a standalone, leader elected process.",
+    )
+
+    subparsers.add_parser(
+        "catch-up-scheduled-transactions",
+        help="Create the runs of scheduled transactions missed up to today.",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild-monthly-summary":
+        asyncio.run(rebuild_monthly_summary(args.wallet_id))
+    elif args.command == "run-scheduler":
+        asyncio.run(run_scheduler())
+    elif args.command == "catch-up-scheduled-transactions":
+        asyncio.run(catch_up_scheduled_transactions())
+
+
+if __name__ == "__main__":
+    main()
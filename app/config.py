@@ -1,7 +1,7 @@
 import os
 import sys
 from functools import lru_cache
-from typing import List
+from typing import List, Literal, Optional
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -31,6 +31,24 @@ class Settings(BaseSettings):
     db_password: str
     db_user: str
 
+    db_role: Literal["api", "worker"] = "api"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_worker_pool_size: Optional[int] = None
+    db_worker_max_overflow: Optional[int] = None
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+    db_pgbouncer: bool = False
+    db_replica_url: Optional[str] = None
+    db_read_primary_cookie_name: str = "read_primary"
+    db_read_primary_seconds: int = 5
+
+    query_stats_enabled: bool = True
+    query_stats_count_threshold: int = 30
+    query_stats_repeated_threshold: int = 10
+
     refresh_token_name: str = "refresh_token"
     access_token_name: str = "access_token"
     verify_token_secret_key: str
@@ -53,7 +71,22 @@ class Settings(BaseSettings):
     celery_broker_url: str = "redis://127.0.0.1:6379/0"
     celery_result_backend: str = "redis://127.0.0.1:6379/0"
 
+    worker_async_concurrency: int = 1
+
+    scheduler_in_api: bool = True
+    scheduler_lock_id: int = 7311
+    scheduler_leader_retry_seconds: float = 15
+    scheduler_lock_db_url: Optional[str] = None
+
+    reference_cache_ttl_seconds: float = 300
+
+    default_time_zone: str = "UTC"
+    wallet_feed_day_limit: int = 14
+
     batch_size: int = 1000
+    scheduled_transaction_shard_count: int = 8
+    import_spool_dir: str = "spool"
+    upload_chunk_size: int = 1024 * 1024
 
     def __init__(self, **values):
         super().__init__(**values)
@@ -1,6 +1,196 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from typing import Any, AsyncGenerator, Optional
+from uuid import uuid4
 
-from app.config import settings
+from fastapi import Request
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
-engine = create_async_engine(settings.db_url, future=True)
+from app.config import Settings, settings
+from app.utils.query_stats import register_query_stats
+
+
+def get_engine_options(config: Settings) -> dict[str, Any]:
+    """
+    Builds the engine keyword arguments for the role of the current process.
+
+    The API and the Celery workers share the pool timeout, recycle and
+    pre ping settings, but can be sized separately through the
+    db_worker_* settings, which fall back to the API sizes.
+
+    Args:
+        config: The application settings.
+
+    Returns:
+        dict[str, Any]: Keyword arguments for create_async_engine.
+    """
+
+    pool_size = config.db_pool_size
+    max_overflow = config.db_max_overflow
+
+    if config.db_role == "worker":
+        if config.db_worker_pool_size is not None:
+            pool_size = config.db_worker_pool_size
+        if config.db_worker_max_overflow is not None:
+            max_overflow = config.db_worker_max_overflow
+
+    connect_args: dict[str, Any] = {
+        "statement_cache_size": config.db_statement_cache_size
+    }
+
+    if config.db_pgbouncer:
+        # PgBouncer in transaction mode can hand every statement to another
+        # server connection, so named prepared statements must not be reused.
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": config.db_pool_timeout,
+        "pool_recycle": config.db_pool_recycle,
+        "pool_pre_ping": config.db_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+engine = create_async_engine(
+    settings.db_url, future=True, **get_engine_options(settings)
+)
 SessionLocal = async_sessionmaker(expire_on_commit=False, bind=engine)
+
+replica_engine = (
+    create_async_engine(
+        settings.db_replica_url, future=True, **get_engine_options(settings)
+    )
+    if settings.db_replica_url
+    else engine
+)
+ReplicaSessionLocal = async_sessionmaker(expire_on_commit=False, bind=replica_engine)
+
+if settings.query_stats_enabled:
+    register_query_stats(engine.sync_engine)
+    register_query_stats(replica_engine.sync_engine)
+
+READ_ONLY_METHODS = ("GET", "HEAD")
+
+
+def create_scheduler_lock_engine(config: Settings) -> AsyncEngine:
+    """
+    Creates the engine that holds the advisory lock of the scheduler leader.
+
+    The lock is bound to a server session, which PgBouncer in transaction
+    mode does not keep. Behind PgBouncer the lock therefore needs a direct
+    connection to Postgres, configured by scheduler_lock_db_url.
+
+    Args:
+        config: The application settings.
+
+    Returns:
+        AsyncEngine: An engine with a single connection for the lock.
+
+    Raises:
+        ValueError: If db_pgbouncer is set without a scheduler_lock_db_url.
+    """
+
+    db_url: Optional[str] = config.scheduler_lock_db_url
+    if db_url is None:
+        if config.db_pgbouncer:
+            raise ValueError(
+                "The scheduler leader needs a direct database connection "
+                "behind PgBouncer, set scheduler_lock_db_url"
+            )
+        db_url = config.db_url
+
+    return create_async_engine(
+        db_url,
+        future=True,
+        pool_size=1,
+        max_overflow=0,
+        pool_pre_ping=config.db_pool_pre_ping,
+    )
+
+
+def _get_engines() -> list[AsyncEngine]:
+    """
+    Returns the primary and, if configured, the replica engine.
+
+    Returns:
+        list[AsyncEngine]: The engines of the application.
+    """
+
+    return [engine] if replica_engine is engine else [engine, replica_engine]
+
+
+def reset_engine_pools() -> None:
+    """
+    Replaces the connection pools inherited from a parent process.
+
+    The connections of the parent are left open for the parent, the engines
+    then open new connections in the current process, on its own event loop.
+    Must be called right after a fork, before the first query.
+    """
+
+    for db_engine in _get_engines():
+        db_engine.sync_engine.dispose(close=False)
+
+
+async def dispose_engines() -> None:
+    """
+    Closes all pooled connections of the engines.
+    """
+
+    for db_engine in _get_engines():
+        await db_engine.dispose()
+
+
+def is_read_only_request(request: Request) -> bool:
+    """
+    Checks whether a request can be answered from the read replica.
+
+    Only safe methods qualify, and only if the client has not written
+    recently. After a write the read primary cookie is set, so the page the
+    client is redirected to already shows its own changes.
+
+    Args:
+        request: The incoming request.
+
+    Returns:
+        bool: True if the request may read from the replica.
+    """
+
+    return (
+        request.method in READ_ONLY_METHODS
+        and settings.db_read_primary_cookie_name not in request.cookies
+    )
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yields a session wrapped in a single database transaction.
+
+    Used as a FastAPI dependency, so every service of a request shares the
+    same session. The transaction is committed once when the request has been
+    handled and rolled back if an exception was raised. Read only requests
+    get a session of the replica, which is the primary if no replica is
+    configured.
+
+    Args:
+        request: The incoming request.
+
+    Yields:
+        AsyncSession: The request scoped session.
+    """
+
+    session_maker = (
+        ReplicaSessionLocal if is_read_only_request(request) else SessionLocal
+    )
+
+    async with session_maker.begin() as session:
+        yield session
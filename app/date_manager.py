@@ -3,6 +3,9 @@ from contextlib import suppress
 from datetime import datetime as dt
 from datetime import timedelta, timezone
 from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.config import settings
 
 
 def get_today():
@@ -184,6 +187,25 @@ def get_last_day_of_month(date: dt):
     return last_day_of_month.day
 
 
+def get_utc_month_start(date: dt) -> datetime.date:
+    """
+    Get the first day of the UTC month of a date.
+
+    Naive dates are treated as UTC, like the database driver does.
+
+    Args:
+        date: The reference date.
+
+    Returns:
+        The first day of the month.
+    """
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+
+    return date.astimezone(timezone.utc).date().replace(day=1)
+
+
 def get_iso_timestring() -> str:
     """
     Returns the current time in ISO 8601 format.
@@ -192,3 +214,22 @@ def get_iso_timestring() -> str:
         str: The current time in ISO 8601 format.
     """
     return datetime.datetime.now().isoformat()
+
+
+def get_time_zone_name(time_zone: Optional[str]) -> str:
+    """
+    Get a valid IANA time zone name.
+
+    Args:
+        time_zone: The requested time zone, for example from a cookie.
+
+    Returns:
+        The requested time zone if it exists, the default time zone otherwise.
+    """
+
+    if time_zone:
+        with suppress(ZoneInfoNotFoundError, ValueError):
+            ZoneInfo(time_zone)
+            return time_zone
+
+    return settings.default_time_zone
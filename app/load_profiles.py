@@ -0,0 +1,91 @@
+from typing import Optional, Type
+
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app import models
+from app.utils.enums import LoadProfile
+
+Transaction = models.Transaction
+TransactionScheduled = models.TransactionScheduled
+TransactionInformation = models.TransactionInformation
+TransactionCategory = models.TransactionCategory
+
+# Relationships that fan out, like offset transactions, the wallet of a
+# transaction and the transactions created by a schedule, raise when they are
+# accessed without being loaded. A profile names everything a use case needs,
+# so a query loads exactly that in a fixed number of statements.
+LOAD_PROFILES: dict[type, dict[LoadProfile, tuple[LoaderOption, ...]]] = {
+    Transaction: {
+        LoadProfile.LIST: (
+            selectinload(Transaction.information).selectinload(
+                TransactionInformation.category
+            ),
+            selectinload(Transaction.offset_transaction).options(
+                selectinload(Transaction.wallet),
+                raiseload(Transaction.information),
+            ),
+        ),
+        LoadProfile.DETAIL: (
+            selectinload(Transaction.information).selectinload(
+                TransactionInformation.category
+            ),
+            selectinload(Transaction.offset_transaction).options(
+                selectinload(Transaction.information),
+                selectinload(Transaction.wallet),
+            ),
+        ),
+        LoadProfile.IMPORT: (raiseload("*"),),
+    },
+    TransactionScheduled: {
+        LoadProfile.LIST: (
+            selectinload(TransactionScheduled.information).selectinload(
+                TransactionInformation.category
+            ),
+            selectinload(TransactionScheduled.frequency),
+            selectinload(TransactionScheduled.offset_wallet),
+        ),
+        LoadProfile.DETAIL: (
+            selectinload(TransactionScheduled.information).selectinload(
+                TransactionInformation.category
+            ),
+            selectinload(TransactionScheduled.frequency),
+            selectinload(TransactionScheduled.wallet),
+            selectinload(TransactionScheduled.offset_wallet),
+        ),
+        LoadProfile.SCHEDULER: (
+            selectinload(TransactionScheduled.information),
+            selectinload(TransactionScheduled.wallet),
+            raiseload(TransactionScheduled.frequency),
+            raiseload(TransactionScheduled.offset_wallet),
+        ),
+    },
+    TransactionCategory: {
+        LoadProfile.IMPORT: (raiseload("*"),),
+        LoadProfile.REFERENCE: (
+            selectinload(TransactionCategory.section),
+            raiseload(TransactionCategory.user),
+        ),
+    },
+}
+
+
+def get_load_options(
+    cls: Type, load_profile: Optional[LoadProfile]
+) -> tuple[LoaderOption, ...]:
+    """
+    Returns the loader options of a load profile for a model.
+
+    Args:
+        cls: The model class that is queried.
+        load_profile: The load profile, None keeps the relationship defaults.
+
+    Returns:
+        tuple[LoaderOption, ...]: The loader options, empty if the model
+            has no such profile.
+    """
+
+    if load_profile is None:
+        return ()
+
+    return LOAD_PROFILES.get(cls, {}).get(load_profile, ())
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timezone
@@ -26,6 +27,7 @@ from app import models, templates
 from app.authentication.dependencies import get_strategy
 from app.authentication.strategies import JWTAccessRefreshStrategy
 from app.config import settings
+from app.database import create_scheduler_lock_engine
 from app.exception_handler import (
     bad_request_exception_handler,
     entity_access_denied_exception_handler,
@@ -44,11 +46,16 @@ from app.exceptions.base_service_exception import (
     EntityNotFoundException,
 )
 from app.logger import get_logger
-from app.middleware import HeaderLinkMiddleware
+from app.middleware import (
+    HeaderLinkMiddleware,
+    QueryStatsMiddleware,
+    ReadPrimaryMiddleware,
+)
 from app.repository import Repository
 from app.routes import router_list
-from app.scheduled_tasks import add_jobs_to_scheduler
+from app.scheduled_tasks import run_scheduler_as_leader
 from app.utils import BreadcrumbBuilder
+from app.utils.reference_cache import reference_cache
 
 logger = get_logger(__name__)
 scheduler = AsyncIOScheduler()
@@ -67,11 +74,29 @@ async def lifespan(_api_app: FastAPI):
 
     """
 
+    await reference_cache.warm_up()
+
+    leader_task = None
+    lock_engine = None
+    if settings.scheduler_in_api:
+        lock_engine = create_scheduler_lock_engine(settings)
+        leader_task = asyncio.create_task(
+            run_scheduler_as_leader(scheduler, lock_engine)
+        )
+
     try:
-        add_jobs_to_scheduler(scheduler)
         yield
     finally:
-        scheduler.shutdown()
+        if leader_task is not None:
+            leader_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await leader_task
+
+        if scheduler.running:
+            scheduler.shutdown()
+
+        if lock_engine is not None:
+            await lock_engine.dispose()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -89,6 +114,13 @@ app.add_middleware(
 )
 
 app.add_middleware(HeaderLinkMiddleware)
+
+if settings.db_replica_url:
+    app.add_middleware(ReadPrimaryMiddleware)
+
+if settings.query_stats_enabled:
+    app.add_middleware(QueryStatsMiddleware)
+
 app.add_middleware(SessionMiddleware, secret_key=settings.session_secret_key)
 app.add_middleware(CSRFProtectMiddleware, csrf_secret=settings.csrf_secret)
 
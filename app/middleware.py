@@ -1,6 +1,10 @@
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
+from app.config import settings
+from app.database import READ_ONLY_METHODS
+from app.utils.query_stats import track_queries
+
 
 class HeaderLinkMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -23,3 +27,60 @@ class HeaderLinkMiddleware(BaseHTTPMiddleware):
             # },
         ]
         return await call_next(request)
+
+
+class ReadPrimaryMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        """
+        Pins the reads of a client to the primary for a short time after a write.
+
+        The replica may lag behind the primary, so a successful write sets a
+        short lived cookie. As long as it is present, get_session serves the
+        client from the primary.
+
+        Args:
+            self: The instance of the middleware.
+            request (Request): The incoming request object.
+            call_next (Callable): The next middleware or route handler.
+
+        Returns:
+            Awaitable: The response returned by the next middleware or route handler.
+        """
+        response = await call_next(request)
+
+        if request.method not in READ_ONLY_METHODS and response.status_code < 400:
+            response.set_cookie(
+                settings.db_read_primary_cookie_name,
+                "1",
+                max_age=settings.db_read_primary_seconds,
+                httponly=True,
+                secure=settings.secure_cookie,
+                samesite="lax",
+            )
+
+        return response
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        """
+        Tracks the database queries of a request.
+
+        The totals are added as Server-Timing header and logged, requests
+        with too many or repeated queries are logged as warnings.
+
+        Args:
+            self: The instance of the middleware.
+            request (Request): The incoming request object.
+            call_next (Callable): The next middleware or route handler.
+
+        Returns:
+            Awaitable: The response returned by the next middleware or route handler.
+        """
+        with track_queries(f"{request.method} {request.url.path}") as query_stats:
+            response = await call_next(request)
+
+        response.headers.append("Server-Timing", query_stats.get_server_timing())
+        query_stats.log()
+
+        return response
@@ -2,7 +2,17 @@ from fastapi_users.db import (
     SQLAlchemyBaseOAuthAccountTableUUID,
     SQLAlchemyBaseUserTableUUID,
 )
-from sqlalchemy import DECIMAL, Boolean, Column, Integer, String, UniqueConstraint, text
+from sqlalchemy import (
+    DECIMAL,
+    Boolean,
+    Column,
+    Date,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import DeclarativeBase, Mapped, relationship
@@ -132,13 +142,15 @@ class Transaction(BaseModel):
         foreign_keys=[offset_transactions_id],
         post_update=True,
         cascade="all,delete",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
-    wallet = relationship("Wallet", back_populates="transactions", lazy="selectin")
+    wallet = relationship("Wallet", back_populates="transactions", lazy="raise_on_sql")
 
     scheduled_transaction = relationship(
-        "TransactionScheduled", back_populates="created_transactions"
+        "TransactionScheduled",
+        back_populates="created_transactions",
+        lazy="raise_on_sql",
     )
 
     __table_args__ = (
@@ -147,6 +159,8 @@ class Transaction(BaseModel):
             "information_id",
             name="uq_scheduled_transaction_date",
         ),
+        Index("ix_transactions_information_id", "information_id"),
+        Index("ix_transactions_wallet_id", "wallet_id"),
     )
 
 
@@ -184,14 +198,19 @@ class TransactionScheduled(BaseModel):
     frequency_id = Column(Integer, ForeignKey("frequencies.id", ondelete="CASCADE"))
     date_start = Column(type_=TIMESTAMP(timezone=True))
     date_end = Column(type_=TIMESTAMP(timezone=True))
+    next_run_at = Column(type_=TIMESTAMP(timezone=True))
 
     created_transactions = relationship(
         "Transaction",
         back_populates="scheduled_transaction",
-        lazy="selectin",
+        lazy="raise",
         foreign_keys=[Transaction.scheduled_transaction_id],
     )
 
+    __table_args__ = (
+        Index("ix_transactions_scheduled_next_run_at", "is_active", "next_run_at"),
+    )
+
 
 class Wallet(BaseModel, UserId):
     __tablename__ = "wallets"
@@ -200,15 +219,17 @@ class Wallet(BaseModel, UserId):
     description = Column(String(128))
     balance = Column(DECIMAL(10, 2), default=0)
     transactions = relationship(
-        "Transaction", back_populates="wallet", cascade="all,delete", lazy=True
+        "Transaction", back_populates="wallet", cascade="all,delete", lazy="raise"
     )
     scheduled_transactions = relationship(
         "TransactionScheduled",
         cascade="all,delete",
         foreign_keys=[TransactionScheduled.wallet_id],
-        lazy=True,
+        lazy="raise",
     )
 
+    __table_args__ = (Index("ix_wallets_user_id", "user_id"),)
+
 
 class TransactionInformation(BaseModel):
     __tablename__ = "transactions_information"
@@ -219,6 +240,34 @@ class TransactionInformation(BaseModel):
     category = relationship("TransactionCategory", lazy="selectin")
     category_id = Column(Integer, ForeignKey("transactions_category.id"))
 
+    __table_args__ = (Index("ix_transactions_information_date_id", "date", "id"),)
+
+
+class WalletMonthlySummary(BaseModel):
+    __tablename__ = "wallet_monthly_summary"
+
+    wallet_id = Column(
+        Integer,
+        ForeignKey("wallets.id", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+    )
+    month = Column(Date, nullable=False)
+    category_id = Column(
+        Integer, ForeignKey("transactions_category.id"), nullable=False
+    )
+    income = Column(DECIMAL(12, 2), nullable=False, server_default=text("0"))
+    expense = Column(DECIMAL(12, 2), nullable=False, server_default=text("0"))
+    count = Column(Integer, nullable=False, server_default=text("0"))
+
+    __table_args__ = (
+        UniqueConstraint(
+            "wallet_id",
+            "month",
+            "category_id",
+            name="uq_wallet_monthly_summary",
+        ),
+    )
+
 
 class Frequency(BaseModel):
     __tablename__ = "frequencies"
@@ -244,3 +293,12 @@ class TransactionCategory(BaseModel):
     label = Column(String(36))
     section = relationship("TransactionSection", lazy="selectin")
     section_id = Column(Integer, ForeignKey("transactions_section.id"))
+
+
+class JobWatermark(BaseModel):
+    __tablename__ = "job_watermarks"
+
+    name = Column(String(64), nullable=False)
+    run_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+    __table_args__ = (UniqueConstraint("name", name="uq_job_watermarks_name"),)
@@ -1,34 +1,100 @@
-from datetime import datetime, timedelta
-from typing import Any, List, Optional, Tuple, Type, Union
-
-from sqlalchemy import Select, exists, func, text
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, AsyncIterator, List, Optional, Tuple, Type, Union
+
+from sqlalchemy import (
+    TIMESTAMP,
+    ColumnElement,
+    Date,
+    Integer,
+    Interval,
+    Row,
+    Select,
+    and_,
+    case,
+    cast,
+    column,
+)
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import exists, func, insert, literal, literal_column, text, true, tuple_
 from sqlalchemy import update as sql_update
+from sqlalchemy import values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload, selectinload
-from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm.attributes import InstrumentedAttribute, set_committed_value
+from sqlalchemy.orm.util import identity_key
 
 from app import models
 from app.database import SessionLocal
 from app.exceptions.base_service_exception import EntityNotFoundException
-from app.utils.enums import DatabaseFilterOperator, Frequency
+from app.load_profiles import get_load_options
+from app.utils.dataclasses_utils import FinancialSummary, TransactionListItem
+from app.utils.enums import DatabaseFilterOperator, Frequency, LoadProfile
 from app.utils.fields import IdField
 from app.utils.types import ModelT
 
 
 class Repository:
+    def __init__(self, session: Optional[AsyncSession] = None):
+        """
+        Initializes the repository.
+
+        Args:
+            session: Optional unit of work session. When provided, every method
+                runs on it and writes are only flushed, leaving the commit to
+                the owner of the session. Without it, each call opens its own
+                short lived session.
+        """
+
+        self.session = session
+
+    @asynccontextmanager
+    async def _session_scope(self, write: bool = False) -> AsyncIterator[AsyncSession]:
+        """Provide the session a repository call should run on.
+
+        Args:
+            write: Whether the call modifies data and needs to be persisted.
+
+        Yields:
+            AsyncSession: The unit of work session or a new session.
+        """
+        if self.session is not None:
+            yield self.session
+            if write:
+                await self.session.flush()
+            return
+
+        async with SessionLocal() as session:
+            if not write:
+                yield session
+                return
+
+            async with session.begin():
+                yield session
 
     def _load_relationships(
-        self, query: Select, relationships: InstrumentedAttribute = None
+        self,
+        query: Select,
+        relationships: InstrumentedAttribute = None,
+        load_profile: Optional[LoadProfile] = None,
     ) -> Select:
         """Apply loading options for specified relationships to a query.
 
         Args:
             query: The SQLAlchemy query object.
             *relationships: Class-bound attributes representing relationships to load.
+            load_profile: Optional load profile of the queried model.
 
         Returns:
             The modified query with loading options applied.
         """
+        if load_profile is not None:
+            query = query.options(
+                *get_load_options(query.column_descriptions[0]["entity"], load_profile)
+            )
         if relationships:
             options = [selectinload(rel) for rel in relationships]
             query = query.options(*options)
@@ -38,19 +104,21 @@ class Repository:
         self,
         cls: Type[ModelT],
         load_relationships_list: Optional[list[InstrumentedAttribute]] = None,
+        load_profile: Optional[LoadProfile] = None,
     ) -> list[ModelT]:
         """Retrieve all instances of the specified model from the database.
 
         Args:
             cls: The type of the model.
             load_relationships: Optional list of relationships to load.
+            load_profile: Optional load profile that selects the relationships to load.
 
         Returns:
             list[ModelT]: A list of instances of the specified model.
         """
         q = select(cls)
-        q = self._load_relationships(q, load_relationships_list)
-        async with SessionLocal() as session:
+        q = self._load_relationships(q, load_relationships_list, load_profile)
+        async with self._session_scope() as session:
             result = await session.execute(q)
         return result.unique().scalars().all()
 
@@ -59,6 +127,7 @@ class Repository:
         cls: Type[ModelT],
         instance_id: Union[int, IdField],
         load_relationships_list: Optional[list[InstrumentedAttribute]] = None,
+        load_profile: Optional[LoadProfile] = None,
     ) -> ModelT:
         """Retrieve an instance of the specified model by its ID.
 
@@ -66,6 +135,7 @@ class Repository:
             cls: The type of the model.
             instance_id: The ID of the instance to retrieve.
             load_relationships: Optional list of relationships to load.
+            load_profile: Optional load profile that selects the relationships to load.
 
         Returns:
             Optional[ModelT]:
@@ -73,9 +143,57 @@ class Repository:
                 the given ID, or None if not found.
         """
         q = select(cls).where(cls.id == instance_id)
-        q = self._load_relationships(q, load_relationships_list)
+        q = self._load_relationships(q, load_relationships_list, load_profile)
 
-        async with SessionLocal() as session:
+        async with self._session_scope() as session:
+            result = await session.execute(q)
+
+        model = result.scalars().first()
+
+        if model is None:
+            raise EntityNotFoundException(cls, instance_id)
+
+        return model
+
+    async def get_owned(
+        self,
+        cls: Type[ModelT],
+        instance_id: Union[int, IdField],
+        user_id: Any,
+        load_profile: Optional[LoadProfile] = None,
+    ) -> ModelT:
+        """Retrieve an instance of a wallet bound model that belongs to a user.
+
+        The wallet of the instance is joined with its user in the WHERE
+        clause, so the ownership is checked by the same query that loads
+        the instance. Wallets are filtered by their own user ID.
+
+        Args:
+            cls: The type of the model, a wallet or a model with a wallet_id.
+            instance_id: The ID of the instance to retrieve.
+            user_id: The ID of the user the wallet must belong to.
+            load_profile: Optional load profile that selects the relationships to load.
+
+        Returns:
+            ModelT: The instance of the specified model with the given ID.
+
+        Raises:
+            EntityNotFoundException: If the instance does not exist or its
+                wallet belongs to another user.
+        """
+        wallet = models.Wallet
+        q = select(cls).where(cls.id == instance_id)
+
+        if cls is wallet:
+            q = q.where(wallet.user_id == user_id)
+        else:
+            q = q.join(wallet, cls.wallet_id == wallet.id).where(
+                wallet.user_id == user_id
+            )
+
+        q = self._load_relationships(q, None, load_profile)
+
+        async with self._session_scope() as session:
             result = await session.execute(q)
 
         model = result.scalars().first()
@@ -85,13 +203,85 @@ class Repository:
 
         return model
 
-    async def filter_by(
+    async def has_wallet_access(self, wallet_id: int, user_id: Any) -> bool:
+        """Check whether a wallet belongs to a user, without loading it.
+
+        Args:
+            wallet_id: The ID of the wallet.
+            user_id: The ID of the user.
+
+        Returns:
+            bool: True if the wallet exists and belongs to the user.
+        """
+        wallet = models.Wallet
+        query = select(
+            exists().where(wallet.id == wallet_id, wallet.user_id == user_id)
+        )
+
+        async with self._session_scope() as session:
+            result = await session.execute(query)
+        return result.scalar_one()
+
+    @staticmethod
+    def _get_filter_condition(
+        attribute: InstrumentedAttribute,
+        value: Any,
+        operator: DatabaseFilterOperator,
+    ) -> ColumnElement[bool]:
+        """Build the column expression for a single filter.
+
+        The value is always sent as a bound parameter, so queries that only
+        differ in their values share one compiled statement.
+
+        Args:
+            attribute: The attribute to filter by.
+            value: The value to filter with. IN and NOT_IN expect an iterable,
+                BETWEEN expects a (lower, upper) tuple.
+            operator: The operator to use for the filter.
+
+        Returns:
+            ColumnElement[bool]: The filter condition.
+
+        Raises:
+            ValueError: If the operator is not supported.
+        """
+        match operator:
+            case DatabaseFilterOperator.EQUAL:
+                return attribute == value
+            case DatabaseFilterOperator.NOT_EQUAL:
+                return attribute != value
+            case DatabaseFilterOperator.LESS_THAN:
+                return attribute < value
+            case DatabaseFilterOperator.LESS_THAN_OR_EQUAL:
+                return attribute <= value
+            case DatabaseFilterOperator.GREATER_THAN:
+                return attribute > value
+            case DatabaseFilterOperator.GREATER_THAN_OR_EQUAL:
+                return attribute >= value
+            case DatabaseFilterOperator.LIKE:
+                return attribute.ilike(f"%{value}%")
+            case DatabaseFilterOperator.IS_NOT:
+                return attribute.is_not(value)
+            case DatabaseFilterOperator.IN:
+                return attribute.in_(value)
+            case DatabaseFilterOperator.NOT_IN:
+                return attribute.not_in(value)
+            case DatabaseFilterOperator.BETWEEN:
+                lower, upper = value
+                return attribute.between(lower, upper)
+            case _:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+
+    async def filter_by(  # pylint: disable=too-many-arguments
         self,
         cls: Type[ModelT],
         attribute: InstrumentedAttribute,
         value: Any,
         operator: DatabaseFilterOperator = DatabaseFilterOperator.EQUAL,
         load_relationships_list: Optional[list[str]] = None,
+        order_by: Optional[List[ColumnElement]] = None,
+        limit: Optional[int] = None,
+        load_profile: Optional[LoadProfile] = None,
     ) -> list[ModelT]:
         """
         Filters the records of a given model by a specified attribute and value.
@@ -101,6 +291,10 @@ class Repository:
             attribute: The attribute to filter by.
             value: The value to filter with.
             operator: The operator to use for the filter (default: EQUAL).
+            load_relationships_list: Optional list of relationships to load.
+            order_by: Optional list of columns or column expressions to order by.
+            limit: Optional maximum number of records to return.
+            load_profile: Optional load profile that selects the relationships to load.
 
         Returns:
             list[Type[ModelT]]: The filtered records.
@@ -108,26 +302,24 @@ class Repository:
         Raises:
             None
         """
-        if operator == DatabaseFilterOperator.LIKE:
-            condition = attribute.ilike(f"%{value}%")
-        elif operator == DatabaseFilterOperator.IS_NOT:
-            condition = attribute.is_not(value)
-        else:
-            condition = text(f"{attribute.key} {operator.value} :val")
-
-        q = select(cls).where(condition).params(val=value)
-        q = self._load_relationships(q, load_relationships_list)
 
-        async with SessionLocal() as session:
-            result = await session.execute(q)
-
-        return result.unique().scalars().all()
+        return await self.filter_by_multiple(
+            cls,
+            [(attribute, value, operator)],
+            load_relationships_list,
+            order_by=order_by,
+            limit=limit,
+            load_profile=load_profile,
+        )
 
-    async def filter_by_multiple(
+    async def filter_by_multiple(  # pylint: disable=too-many-arguments
         self,
         cls: Type[ModelT],
         conditions: List[Tuple[InstrumentedAttribute, Any, DatabaseFilterOperator]],
         load_relationships_list: Optional[list[str]] = None,
+        order_by: Optional[List[ColumnElement]] = None,
+        limit: Optional[int] = None,
+        load_profile: Optional[LoadProfile] = None,
     ) -> list[ModelT]:
         """
         Filters the records of a given model by multiple attributes and values.
@@ -135,53 +327,147 @@ class Repository:
         Args:
             cls: The model class.
             conditions: A list of tuples where each tuple contains an attribute to filter by,
-                        a value to filter with, and an optional operator
-                        (if not provided, EQUAL is used).
+                        a value to filter with and the operator to use.
             load_relationships_list: Optional list of relationships to load.
+            order_by: Optional list of columns or column expressions to order by.
+            limit: Optional maximum number of records to return.
+            load_profile: Optional load profile that selects the relationships to load.
 
         Returns:
             list[ModelT]: The filtered records.
         """
 
-        where_conditions = []
-        params = {}
-        for i, (attribute, value, operator) in enumerate(conditions):
-            param_name = f"val{i}"
-
-            if operator == DatabaseFilterOperator.LIKE:
-                condition = attribute.ilike(f"%{value}%")
-            elif operator == DatabaseFilterOperator.IS_NOT:
-                condition = attribute.is_not(value)
-            else:
-                condition = text(f"{attribute.key} {operator.value} :{param_name}")
-                params[param_name] = value
+        q = select(cls).where(
+            *[
+                self._get_filter_condition(attribute, value, operator)
+                for attribute, value, operator in conditions
+            ]
+        )
 
-            where_conditions.append(condition)
+        if order_by:
+            q = q.order_by(*order_by)
 
-        q = select(cls)
-        if where_conditions:
-            for condition in where_conditions:
-                q = q.where(condition)
+        if limit is not None:
+            q = q.limit(limit)
 
-        q = q.params(**params)
-        q = self._load_relationships(q, load_relationships_list)
+        q = self._load_relationships(q, load_relationships_list, load_profile)
 
-        async with SessionLocal() as session:
+        async with self._session_scope() as session:
             result = await session.execute(q)
 
         return result.scalars().unique().all()
 
-    async def get_scheduled_transactions_by_frequency(
+    @staticmethod
+    def _get_scheduled_due_condition(today: datetime) -> ColumnElement[bool]:
+        """
+        Builds the condition of active scheduled transactions with at least
+        one due run, including runs missed before their end date. It is
+        matched by the (is_active, next_run_at) index.
+
+        Args:
+            today: The current date to use for filtering.
+
+        Returns:
+            ColumnElement[bool]: The condition on transactions_scheduled.
+        """
+        model = models.TransactionScheduled
+
+        return and_(
+            model.is_active == True,  # pylint: disable=singleton-comparison
+            model.next_run_at <= today,
+            model.next_run_at <= model.date_end,
+        )
+
+    @staticmethod
+    def _get_frequency_interval(
+        frequency_id: ColumnElement[int],
+    ) -> ColumnElement[timedelta]:
+        """
+        Builds the interval between two runs of a frequency.
+
+        Args:
+            frequency_id: The frequency ID column of the scheduled transaction.
+
+        Returns:
+            ColumnElement[timedelta]: The interval, NULL for an unknown frequency.
+        """
+        interval_map = {
+            Frequency.DAILY.value: "1 day",
+            Frequency.WEEKLY.value: "7 days",
+            Frequency.MONTHLY.value: "1 month",
+            Frequency.YEARLY.value: "1 year",
+        }
+
+        return case(
+            {
+                frequency: literal_column(f"interval '{interval}'", Interval)
+                for frequency, interval in interval_map.items()
+            },
+            value=frequency_id,
+        )
+
+    def _get_next_run_at(
         self,
-        frequency_id: int,
-        today: datetime,
+        frequency_id: ColumnElement[int],
+        run_date: Union[datetime, ColumnElement[datetime]],
+    ) -> ColumnElement[datetime]:
+        """
+        Builds the date of the run following a run on the given day.
+
+        Months and years are added by the database, so the next run of
+        a monthly scheduled transaction on January 31 is on February 28.
+
+        Args:
+            frequency_id: The frequency ID column of the scheduled transaction.
+            run_date: The date of the current run.
+
+        Returns:
+            ColumnElement[datetime]: The date of the next run, NULL for an
+                unknown frequency.
+        """
+        if isinstance(run_date, datetime):
+            run_date = literal(run_date, TIMESTAMP(timezone=True))
+
+        return func.date_trunc("day", run_date) + self._get_frequency_interval(
+            frequency_id
+        )
+
+    async def advance_scheduled_transaction(
+        self, scheduled_transaction_id: int, run_date: datetime
+    ) -> None:
+        """
+        Move the next run of a scheduled transaction past a run on the given date.
+
+        The next run is never moved backwards, so an older transaction does
+        not make the scheduled transaction due again.
+
+        Args:
+            scheduled_transaction_id: The ID of the scheduled transaction.
+            run_date: The date of the created transaction.
+        """
+        model = models.TransactionScheduled
+        query = (
+            sql_update(model)
+            .where(model.id == scheduled_transaction_id)
+            .values(
+                next_run_at=func.greatest(
+                    model.next_run_at,
+                    self._get_next_run_at(model.frequency_id, run_date),
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        async with self._session_scope(write=True) as session:
+            await session.execute(query)
+
+    async def get_due_scheduled_transactions(
+        self, today: datetime
     ) -> list[models.TransactionScheduled]:
         """
-        Retrieve all scheduled transactions for a specific frequency
-        that are active and not yet processed today.
+        Retrieve all active scheduled transactions whose next run is due.
 
         Args:
-            frequency_id (int): The frequency ID to filter by.
             today (datetime): The current date to use for filtering.
 
         Returns:
@@ -189,42 +475,265 @@ class Repository:
         """
         model = models.TransactionScheduled
 
-        def get_period_start_date(frequency_id: int) -> datetime:
-            match frequency_id:
-                case Frequency.DAILY.value:
-                    return today
-                case Frequency.WEEKLY.value:
-                    return today - timedelta(days=7)
-                case Frequency.MONTHLY.value:
-                    return today.replace(month=today.month - 1)
-                case Frequency.YEARLY.value:
-                    return today.replace(year=today.year - 1)
-                case _:
-                    raise ValueError("Invalid frequency_id")
-
-        period_start_date = get_period_start_date(frequency_id)
-
-        transaction_exists_condition = ~exists(
-            select(models.Transaction)
-            .join(models.TransactionInformation)
-            .where(
-                models.Transaction.scheduled_transaction_id == model.id,
-                func.date(models.TransactionInformation.date) >= period_start_date,
+        query = (
+            select(model)
+            .options(*get_load_options(model, LoadProfile.SCHEDULER))
+            .where(self._get_scheduled_due_condition(today))
+        )
+
+        async with self._session_scope() as session:
+            result = await session.execute(query)
+        return result.scalars().all()
+
+    async def get_last_scheduled_run_date(
+        self, scheduled_transaction_id: int
+    ) -> Optional[datetime]:
+        """
+        Retrieve the date of the latest transaction created by a scheduled
+        transaction.
+
+        Args:
+            scheduled_transaction_id (int): The ID of the scheduled transaction.
+
+        Returns:
+            Optional[datetime]: The date of the latest run, None if it never ran.
+        """
+        transaction = models.Transaction
+        information = models.TransactionInformation
+
+        query = (
+            select(func.max(information.date))
+            .join(transaction, transaction.information_id == information.id)
+            .where(transaction.scheduled_transaction_id == scheduled_transaction_id)
+        )
+
+        async with self._session_scope() as session:
+            result = await session.execute(query)
+        return result.scalar_one()
+
+    async def create_due_scheduled_transactions(
+        self,
+        today: datetime,
+        shard: Optional[Tuple[int, int]] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[Row]:
+        """
+        Create the transactions of all due runs of scheduled transactions in
+        one statement.
+
+        The due scheduled transactions are selected and locked once. Every
+        run from their next run up to today, or their end date if earlier, is
+        expanded with generate_series, so runs missed by an outage are created
+        with their historical dates. The information rows get IDs from the
+        sequence, and both the information and the transaction rows are
+        written with INSERT ... SELECT. The next run of each executed scheduled
+        transaction is advanced past its last run in the same statement.
+        A run is never created twice: the scheduled transactions are locked
+        with FOR UPDATE SKIP LOCKED, so a concurrent run skips them, and their
+        advanced next run excludes the created runs from every later run. No
+        object is loaded into the session.
+
+        Args:
+            today: The date of the run.
+            shard: Optional shard index and shard count. Only scheduled
+                transactions whose wallet ID modulo the count equals the
+                index are executed, so the wallets of two shards never overlap.
+            after_id: Optional ID, only scheduled transactions with a higher
+                ID are executed.
+            limit: Optional maximum number of scheduled transactions, taken
+                in the order of their IDs.
+
+        Returns:
+            list[Row]: The wallet ID, category ID, UTC month, income, expense
+                and number of the created transactions, grouped by wallet,
+                category and month, and the highest executed scheduled
+                transaction ID.
+        """
+        scheduled = models.TransactionScheduled
+        scheduled_table = scheduled.__table__
+        information = models.TransactionInformation
+        information_table = information.__table__
+        transaction_table = models.Transaction.__table__
+
+        due = (
+            select(
+                scheduled.id.label("scheduled_transaction_id"),
+                scheduled.wallet_id,
+                scheduled.frequency_id,
+                scheduled.next_run_at,
+                scheduled.date_end,
+                information.amount,
+                information.reference,
+                information.category_id,
             )
-            .correlate(model)
+            .join(scheduled.information)
+            .where(self._get_scheduled_due_condition(today))
+            .order_by(scheduled.id)
+            .with_for_update(of=scheduled, skip_locked=True)
         )
 
-        query = select(model).where(
-            model.date_start <= today,
-            model.date_end >= today,
-            model.is_active == True,  # pylint: disable=singleton-comparison
-            model.frequency_id == frequency_id,
-            transaction_exists_condition,
+        if shard is not None:
+            shard_index, shard_count = shard
+            due = due.where(scheduled.wallet_id % shard_count == shard_index)
+
+        if after_id is not None:
+            due = due.where(scheduled.id > after_id)
+
+        if limit is not None:
+            due = due.limit(limit)
+
+        due = due.cte("due")
+
+        run_date_series = (
+            func.generate_series(
+                due.c.next_run_at,
+                func.least(literal(today, TIMESTAMP(timezone=True)), due.c.date_end),
+                self._get_frequency_interval(due.c.frequency_id),
+            )
+            .table_valued("run_date")
+            .lateral("run_date_series")
         )
 
-        async with SessionLocal() as session:
+        occurrence = (
+            select(
+                due.c.scheduled_transaction_id,
+                due.c.wallet_id,
+                due.c.frequency_id,
+                due.c.amount,
+                due.c.reference,
+                due.c.category_id,
+                run_date_series.c.run_date,
+                func.nextval(
+                    func.pg_get_serial_sequence(information_table.name, "id")
+                ).label("information_id"),
+            )
+            .select_from(due)
+            .join(run_date_series, true())
+            .cte("occurrence")
+        )
+
+        last_run = (
+            select(
+                occurrence.c.scheduled_transaction_id,
+                occurrence.c.frequency_id,
+                func.max(occurrence.c.run_date).label("run_date"),
+            )
+            .group_by(occurrence.c.scheduled_transaction_id, occurrence.c.frequency_id)
+            .subquery("last_run")
+        )
+
+        advanced = (
+            sql_update(scheduled_table)
+            .where(scheduled_table.c.id == last_run.c.scheduled_transaction_id)
+            .values(
+                next_run_at=self._get_next_run_at(
+                    last_run.c.frequency_id, last_run.c.run_date
+                )
+            )
+            .returning(scheduled_table.c.id)
+            .cte("advanced")
+        )
+
+        new_information = (
+            insert(information_table)
+            .from_select(
+                ["id", "amount", "reference", "date", "category_id"],
+                select(
+                    occurrence.c.information_id,
+                    occurrence.c.amount,
+                    occurrence.c.reference,
+                    occurrence.c.run_date,
+                    occurrence.c.category_id,
+                ),
+            )
+            .returning(information_table.c.id)
+            .cte("new_information")
+        )
+
+        new_transaction = (
+            insert(transaction_table)
+            .from_select(
+                ["wallet_id", "information_id", "scheduled_transaction_id"],
+                select(
+                    occurrence.c.wallet_id,
+                    occurrence.c.information_id,
+                    occurrence.c.scheduled_transaction_id,
+                ).where(occurrence.c.information_id.in_(select(new_information.c.id))),
+            )
+            .returning(transaction_table.c.information_id)
+            .cte("new_transaction")
+        )
+
+        amount = occurrence.c.amount
+        month = cast(
+            func.date_trunc("month", func.timezone("UTC", occurrence.c.run_date)),
+            Date,
+        ).label("month")
+
+        query = (
+            select(
+                occurrence.c.wallet_id,
+                occurrence.c.category_id,
+                month,
+                func.coalesce(func.sum(amount).filter(amount >= 0), 0),
+                func.coalesce(func.sum(amount).filter(amount < 0), 0),
+                func.count(new_transaction.c.information_id),
+                select(func.max(due.c.scheduled_transaction_id)).scalar_subquery(),
+            )
+            .join(
+                new_transaction,
+                new_transaction.c.information_id == occurrence.c.information_id,
+            )
+            .group_by(occurrence.c.wallet_id, occurrence.c.category_id, month)
+            .add_cte(advanced)
+        )
+
+        async with self._session_scope(write=True) as session:
             result = await session.execute(query)
-        return result.scalars().all()
+            return result.all()
+
+    async def get_job_watermark(self, name: str) -> Optional[datetime]:
+        """
+        Retrieve the date of the last successful run of a job.
+
+        Args:
+            name: The name of the job.
+
+        Returns:
+            Optional[datetime]: The date of the last run, None if the job
+                never completed.
+        """
+        model = models.JobWatermark
+        query = select(model.run_at).where(model.name == name)
+
+        async with self._session_scope() as session:
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+
+    async def set_job_watermark(self, name: str, run_at: datetime) -> None:
+        """
+        Record a successful run of a job.
+
+        The watermark only moves forward, so a delayed run of an older date
+        does not hide the runs that completed after it.
+
+        Args:
+            name: The name of the job.
+            run_at: The date of the run.
+        """
+        model = models.JobWatermark
+        query = pg_insert(model).values(name=name, run_at=run_at)
+        query = query.on_conflict_do_update(
+            constraint="uq_job_watermarks_name",
+            set_={
+                "run_at": func.greatest(model.run_at, query.excluded.run_at),
+                "updated_at": func.now(),
+            },
+        )
+
+        async with self._session_scope(write=True) as session:
+            await session.execute(query)
 
     async def get_transactions_from_period(
         self, wallet_id: int, start_date: datetime, end_date: datetime
@@ -248,17 +757,372 @@ class Repository:
 
         query = (
             select(transaction)
-            .options(joinedload(transaction.offset_transaction))
+            .options(*get_load_options(transaction, LoadProfile.LIST))
             .join(transaction.information)
             .filter(class_date <= end_date)
             .filter(class_date >= start_date)
             .filter(wallet_id == transaction.wallet_id)
         )
 
-        async with SessionLocal() as session:
+        async with self._session_scope() as session:
             result = await session.execute(query)
         return result.scalars().all()
 
+    async def get_financial_summary(
+        self, wallet_id: int, start_date: datetime, end_date: datetime
+    ) -> FinancialSummary:
+        """Sum up the income and expenses of a wallet within a given period.
+
+        The totals are calculated by the database in a single query, no
+        transaction is loaded.
+
+        Args:
+            wallet_id: The ID of the wallet.
+            start_date: The start date of the period.
+            end_date: The end date of the period.
+
+        Returns:
+            FinancialSummary: The income, expenses and number of transactions.
+        """
+        amount = models.TransactionInformation.amount
+
+        query = (
+            select(
+                func.coalesce(func.sum(case((amount >= 0, amount), else_=0)), 0),
+                func.coalesce(func.sum(case((amount < 0, amount), else_=0)), 0),
+                func.count(models.Transaction.id),
+            )
+            .select_from(models.Transaction)
+            .join(models.Transaction.information)
+            .where(
+                models.Transaction.wallet_id == wallet_id,
+                models.TransactionInformation.date >= start_date,
+                models.TransactionInformation.date <= end_date,
+            )
+        )
+
+        async with self._session_scope() as session:
+            result = await session.execute(query)
+
+        income, expenses, count = result.one()
+        return FinancialSummary(expenses=expenses, income=income, count=count)
+
+    async def update_monthly_summary(self, summary_list: List[dict]) -> None:
+        """Add income, expense and count deltas to the monthly wallet summaries.
+
+        Missing summary rows are created, existing ones are incremented in
+        the database, so concurrent writers do not overwrite each other.
+
+        Args:
+            summary_list: The deltas, each with wallet_id, month, category_id,
+                income, expense and count.
+        """
+        if not summary_list:
+            return
+
+        model = models.WalletMonthlySummary
+        query = pg_insert(model)
+        query = query.on_conflict_do_update(
+            constraint="uq_wallet_monthly_summary",
+            set_={
+                "income": model.income + query.excluded.income,
+                "expense": model.expense + query.excluded.expense,
+                "count": model.count + query.excluded.count,
+                "updated_at": func.now(),
+            },
+        )
+
+        async with self._session_scope(write=True) as session:
+            await session.execute(query, summary_list)
+
+    async def rebuild_monthly_summary(self, wallet_id: Optional[int] = None) -> None:
+        """Recalculate the monthly wallet summaries from the transactions.
+
+        The summary table is locked against concurrent updates until the
+        rebuild is committed. Writers that wait for the lock apply their
+        delta on top of the rebuilt rows afterwards.
+
+        Args:
+            wallet_id: Optional ID of the only wallet to rebuild.
+        """
+        summary = models.WalletMonthlySummary
+        transaction = models.Transaction
+        information = models.TransactionInformation
+
+        month = cast(
+            func.date_trunc("month", func.timezone("UTC", information.date)), Date
+        ).label("month")
+
+        select_query = (
+            select(
+                transaction.wallet_id,
+                month,
+                information.category_id,
+                func.sum(case((information.amount >= 0, information.amount), else_=0)),
+                func.sum(case((information.amount < 0, information.amount), else_=0)),
+                func.count(transaction.id),
+            )
+            .join(transaction.information)
+            .where(information.category_id.is_not(None))
+            .group_by(transaction.wallet_id, month, information.category_id)
+        )
+        delete_query = sql_delete(summary).execution_options(synchronize_session=False)
+
+        if wallet_id is not None:
+            select_query = select_query.where(transaction.wallet_id == wallet_id)
+            delete_query = delete_query.where(summary.wallet_id == wallet_id)
+
+        insert_query = insert(summary).from_select(
+            [
+                summary.wallet_id,
+                summary.month,
+                summary.category_id,
+                summary.income,
+                summary.expense,
+                summary.count,
+            ],
+            select_query,
+        )
+
+        async with self._session_scope(write=True) as session:
+            await session.execute(
+                text("LOCK TABLE wallet_monthly_summary IN SHARE ROW EXCLUSIVE MODE")
+            )
+            await session.execute(delete_query)
+            await session.execute(insert_query)
+
+    @staticmethod
+    def _get_transaction_list_query(
+        wallet_id: int, start_date: datetime, end_date: datetime
+    ) -> Select:
+        """Build the query of the displayed columns of transactions in a period.
+
+        Args:
+            wallet_id: The ID of the wallet.
+            start_date: The start date of the period.
+            end_date: The end date of the period.
+
+        Returns:
+            Select: The unordered query, with the columns of TransactionListItem.
+        """
+        transaction = models.Transaction
+        information = models.TransactionInformation
+        category = models.TransactionCategory
+        section = models.TransactionSection
+        offset_transaction = aliased(models.Transaction)
+        offset_wallet = aliased(models.Wallet)
+
+        return (
+            select(
+                transaction.id,
+                transaction.wallet_id,
+                transaction.offset_transactions_id,
+                information.id,
+                information.date,
+                information.amount,
+                information.reference,
+                information.category_id,
+                category.label,
+                section.id,
+                section.label,
+                offset_wallet.label,
+            )
+            .select_from(transaction)
+            .join(information, transaction.information_id == information.id)
+            .outerjoin(category, information.category_id == category.id)
+            .outerjoin(section, category.section_id == section.id)
+            .outerjoin(
+                offset_transaction,
+                transaction.offset_transactions_id == offset_transaction.id,
+            )
+            .outerjoin(offset_wallet, offset_transaction.wallet_id == offset_wallet.id)
+            .where(
+                transaction.wallet_id == wallet_id,
+                information.date >= start_date,
+                information.date <= end_date,
+            )
+        )
+
+    async def get_transaction_list_items(
+        self,
+        wallet_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> list[TransactionListItem]:
+        """Retrieve the transactions of a wallet within a given period for display.
+
+        Only the displayed columns are selected, joined in a single query, and
+        mapped to plain list items. No ORM object is created, so the rows are
+        neither tracked by the session nor instrumented.
+
+        Transactions are ordered by date and information ID, newest first.
+        Pages are addressed by keyset, so the cost of a page does not depend
+        on how many pages came before it.
+
+        Args:
+            wallet_id: The ID of the wallet.
+            start_date: The start date of the period.
+            end_date: The end date of the period.
+            limit: Optional maximum number of transactions to return.
+            after: The date and information ID of the last transaction of
+                the previous page.
+
+        Returns:
+            list[TransactionListItem]: The transactions of the period.
+        """
+        information = models.TransactionInformation
+
+        query = self._get_transaction_list_query(
+            wallet_id, start_date, end_date
+        ).order_by(information.date.desc(), information.id.desc())
+
+        if limit is not None:
+            query = query.limit(limit)
+
+        if after is not None:
+            query = query.where(tuple_(information.date, information.id) < after)
+
+        async with self._session_scope() as session:
+            result = await session.execute(query)
+        return [TransactionListItem(*row) for row in result]
+
+    async def get_transaction_feed(  # pylint: disable=too-many-arguments
+        self,
+        wallet_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        time_zone: str,
+        day_limit: Optional[int] = None,
+        before_day: Optional[date] = None,
+    ) -> list[TransactionListItem]:
+        """Retrieve the transactions of a wallet within a period, by calendar day.
+
+        Every item carries its calendar day in the given time zone. The
+        transactions are ordered by date and information ID, newest first,
+        like the date index, and a day in a fixed time zone only grows with
+        the date, so the items of a day are always adjacent.
+
+        Args:
+            wallet_id: The ID of the wallet.
+            start_date: The start date of the period.
+            end_date: The end date of the period.
+            time_zone: The IANA name of the time zone of the calendar days.
+            day_limit: Optional maximum number of days to return, newest first.
+            before_day: Optional day, only earlier days are returned.
+
+        Returns:
+            list[TransactionListItem]: The transactions with their day.
+        """
+        transaction = models.Transaction
+        information = models.TransactionInformation
+        day = cast(func.timezone(time_zone, information.date), Date)
+
+        day_condition_list = [] if before_day is None else [day < before_day]
+
+        if day_limit is not None:
+            first_day = (
+                select(day)
+                .select_from(transaction)
+                .join(information, transaction.information_id == information.id)
+                .where(
+                    transaction.wallet_id == wallet_id,
+                    information.date >= start_date,
+                    information.date <= end_date,
+                    *day_condition_list,
+                )
+                .group_by(day)
+                .order_by(day.desc())
+                .offset(day_limit - 1)
+                .limit(1)
+                .scalar_subquery()
+            )
+            day_condition_list.append(day >= func.coalesce(first_day, date.min))
+
+        query = (
+            self._get_transaction_list_query(wallet_id, start_date, end_date)
+            .add_columns(day.label("day"))
+            .where(*day_condition_list)
+            .order_by(information.date.desc(), information.id.desc())
+        )
+
+        async with self._session_scope() as session:
+            result = await session.execute(query)
+        return [TransactionListItem(*row) for row in result]
+
+    async def get_wallet_rows(self, user_id: Any) -> list[Row]:
+        """Retrieve the displayed columns of all wallets of a user.
+
+        Args:
+            user_id: The ID of the user.
+
+        Returns:
+            list[Row]: The ID, label, description and balance of each wallet.
+        """
+        wallet = models.Wallet
+
+        query = (
+            select(wallet.id, wallet.label, wallet.description, wallet.balance)
+            .where(wallet.user_id == user_id)
+            .order_by(wallet.id)
+        )
+
+        async with self._session_scope() as session:
+            result = await session.execute(query)
+        return result.all()
+
+    async def count_wallets(self, user_id: Any) -> int:
+        """Count the wallets of a user with the user index.
+
+        Args:
+            user_id: The ID of the user.
+
+        Returns:
+            int: The number of wallets of the user.
+        """
+        wallet = models.Wallet
+        query = (
+            select(func.count()).select_from(wallet).where(wallet.user_id == user_id)
+        )
+
+        async with self._session_scope() as session:
+            result = await session.execute(query)
+        return result.scalar_one()
+
+    async def add_wallet_within_limit(self, wallet: models.Wallet, limit: int) -> bool:
+        """Add a wallet unless its user already has the maximum number of wallets.
+
+        The row of the user is locked before the wallets are counted, so
+        concurrent creates for the same user are serialized and each one
+        counts the wallets committed by the others. The lock is held until
+        the end of the transaction that inserts the wallet.
+
+        Args:
+            wallet: The new wallet, with its user ID set.
+            limit: The maximum number of wallets per user.
+
+        Returns:
+            bool: True if the wallet was added, False if the limit is reached.
+        """
+        user = models.User
+        lock_query = select(user.id).where(user.id == wallet.user_id).with_for_update()
+        count_query = (
+            select(func.count())
+            .select_from(models.Wallet)
+            .where(models.Wallet.user_id == wallet.user_id)
+        )
+
+        async with self._session_scope(write=True) as session:
+            await session.execute(lock_query)
+            wallet_count = (await session.execute(count_query)).scalar_one()
+
+            if wallet_count >= limit:
+                return False
+
+            session.add(wallet)
+            return True
+
     async def save(self, obj: Union[ModelT, List[ModelT]]) -> None:
         """Save an object or a list of objects to the database.
 
@@ -272,12 +1136,32 @@ class Repository:
             None
         """
 
-        async with SessionLocal() as session, session.begin():
+        async with self._session_scope(write=True) as session:
             if isinstance(obj, list):
                 session.add_all(obj)
-                return
+            else:
+                session.add(obj)
 
-            session.add(obj)
+    async def bulk_insert(self, cls: Type[ModelT], value_list: List[dict]) -> List[int]:
+        """Insert many rows of the specified model with multi-row INSERT statements.
+
+        The rows are not added to the session, so no ORM objects are created.
+
+        Args:
+            cls: The type of the model.
+            value_list: A list of column values, one dictionary per row.
+
+        Returns:
+            List[int]: The IDs of the inserted rows, in the order of value_list.
+        """
+        if not value_list:
+            return []
+
+        query = insert(cls).returning(cls.id, sort_by_parameter_order=True)
+
+        async with self._session_scope(write=True) as session:
+            result = await session.execute(query, value_list)
+            return result.scalars().all()
 
     async def update(self, cls: Type[ModelT], instance_id: int, **kwargs):
         """Update an instance of the specified model with the given ID.
@@ -299,9 +1183,79 @@ class Repository:
             .values(**kwargs)
             .execution_options(synchronize_session="fetch")
         )
-        async with SessionLocal() as session:
+        async with self._session_scope(write=True) as session:
             await session.execute(query)
 
+    async def update_wallet_balances(self, amount_map: dict[int, Decimal]) -> None:
+        """Atomically add amounts to the balances of many wallets.
+
+        All balances are changed by a single UPDATE joined to the list of
+        amounts, so concurrent writes can not overwrite each other.
+
+        Args:
+            amount_map: The amount to add, by wallet ID. Negative values
+                are subtracted.
+        """
+        if not amount_map:
+            return
+
+        wallet = models.Wallet
+        amount_values = values(
+            column("wallet_id", Integer),
+            column("amount", wallet.balance.type),
+            name="amount_values",
+        ).data(list(amount_map.items()))
+
+        query = (
+            sql_update(wallet)
+            .where(wallet.id == amount_values.c.wallet_id)
+            .values(balance=wallet.balance + amount_values.c.amount)
+            .execution_options(synchronize_session=False)
+        )
+
+        async with self._session_scope(write=True) as session:
+            await session.execute(query)
+
+    async def update_wallet_balance(self, wallet_id: int, amount: Decimal) -> Decimal:
+        """Atomically add an amount to the balance of a wallet.
+
+        The balance is changed by a single UPDATE on the database side, so
+        concurrent writes to the same wallet can not overwrite each other.
+        A wallet instance already loaded into the session gets the new
+        balance without being marked as modified.
+
+        Args:
+            wallet_id: The ID of the wallet to update.
+            amount: The amount to add, negative values are subtracted.
+
+        Returns:
+            Decimal: The new balance of the wallet.
+
+        Raises:
+            EntityNotFoundException: If no wallet with the given ID exists.
+        """
+        wallet = models.Wallet
+        query = (
+            sql_update(wallet)
+            .where(wallet.id == wallet_id)
+            .values(balance=wallet.balance + amount)
+            .returning(wallet.balance)
+            .execution_options(synchronize_session=False)
+        )
+
+        async with self._session_scope(write=True) as session:
+            result = await session.execute(query)
+            balance = result.scalar_one_or_none()
+
+            if balance is None:
+                raise EntityNotFoundException(wallet, wallet_id)
+
+            loaded_wallet = session.identity_map.get(identity_key(wallet, wallet_id))
+            if loaded_wallet is not None:
+                set_committed_value(loaded_wallet, "balance", balance)
+
+        return balance
+
     async def delete(self, obj: Type[ModelT]) -> None:
         """Delete an object from the database.
 
@@ -310,7 +1264,7 @@ class Repository:
 
         """
 
-        async with SessionLocal() as session, session.begin():
+        async with self._session_scope(write=True) as session:
             await session.delete(obj)
 
     async def refresh(self, obj: Type[ModelT]) -> None:
@@ -325,7 +1279,7 @@ class Repository:
         Raises:
             None
         """
-        async with SessionLocal() as session:
+        async with self._session_scope() as session:
             return await session.refresh(obj)
 
     async def refresh_all(self, object_list: List[ModelT]) -> None:
@@ -340,6 +1294,21 @@ class Repository:
         Raises:
             None
         """
-        async with SessionLocal() as session:
+        async with self._session_scope() as session:
             for obj in object_list:
                 await session.refresh(obj)
+
+    async def merge(self, obj: ModelT) -> ModelT:
+        """Attach a copy of a detached object to the session without loading it.
+
+        Used for objects held in a cache, which must not be attached to any
+        session themselves.
+
+        Args:
+            obj: The detached object.
+
+        Returns:
+            ModelT: The copy of the object in the session.
+        """
+        async with self._session_scope() as session:
+            return await session.merge(obj, load=False)
@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Optional
 
-from fastapi import Depends, status
+from fastapi import Depends, Query, Response, status
 
 from app import schemas
 from app.models import User
@@ -13,33 +14,43 @@ router = APIRouterExtended(prefix="/transactions", tags=["Transactions"])
 # pylint: disable=duplicate-code
 
 
-@router.get("/", response_model=list[schemas.TransactionResponse])
+@router.get("/", response_model=schemas.TransactionPage)
 async def api_get_transactions(
     wallet_id: int,
     date_start: datetime,
     date_end: datetime,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     current_user: User = Depends(current_active_verified_user),
     service: TransactionService = Depends(TransactionService.get_instance),
 ):
     """
-    Retrieves a list of transactions.
+    Retrieves a page of transactions, newest first.
+
+    The page is serialized directly, the response model only documents it.
 
     Args:
         wallet_id: The ID of the wallet.
         date_start: The start date for filtering transactions.
         date_end: The end date for filtering transactions.
+        limit: The maximum number of transactions per page.
+        cursor: The next_cursor of the previous page.
         current_user: The current active user.
 
     Returns:
-        list[schemas.TransactionResponse]: A list of transaction information.
+        schemas.TransactionPage: The transactions of the page and the cursor of the next page.
 
     Raises:
-        HTTPException: If the wallet is not found.
+        HTTPException: If the wallet is not found or the cursor is invalid.
     """
 
-    return await service.get_transaction_list(
-        current_user, wallet_id, date_start, date_end
+    transaction_list, next_cursor = await service.get_transaction_page(
+        current_user, wallet_id, date_start, date_end, limit, cursor
+    )
+    page = schemas.TransactionPage.model_construct(
+        transactions=transaction_list, next_cursor=next_cursor
     )
+    return Response(page.model_dump_json(), media_type="application/json")
 
 
 @router.get("/{transaction_id}", response_model=schemas.TransactionResponse)
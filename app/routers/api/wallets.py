@@ -1,4 +1,5 @@
 from fastapi import Depends, File, Response, UploadFile, status
+from pydantic import TypeAdapter
 
 from app import schemas
 from app.models import User
@@ -9,6 +10,7 @@ from app.utils.file_utils import process_csv_file
 
 router = APIRouterExtended(prefix="/wallets", tags=["Wallets"])
 ResponseModel = schemas.WalletData
+ResponseListAdapter = TypeAdapter(list[ResponseModel])
 
 
 @router.get("/", response_model=list[ResponseModel])
@@ -19,6 +21,8 @@ async def api_get_wallets(
     """
         Retrieves a list of wallets.
 
+        The list is serialized directly, the response model only documents it.
+
         Args:
             current_user: The current active user.
 
@@ -26,7 +30,10 @@ async def api_get_wallets(
         list[response_model]: A list of wallet information.
     """
 
-    return await service.get_wallets(current_user)
+    wallet_list = await service.get_wallet_data_list(current_user)
+    return Response(
+        ResponseListAdapter.dump_json(wallet_list), media_type="application/json"
+    )
 
 
 @router.get("/{wallet_id}", response_model=ResponseModel)
@@ -1,6 +1,8 @@
 import calendar
-from datetime import datetime
+from datetime import date, datetime
 from itertools import groupby
+from operator import attrgetter
+from typing import Optional
 
 from fastapi import Cookie, Depends, File, Request, UploadFile
 from fastapi.responses import HTMLResponse, RedirectResponse
@@ -9,6 +11,9 @@ from starlette_wtf import csrf_protect
 
 from app import models, schemas
 from app.auth_manager import current_active_verified_user
+from app.config import settings
+from app.date_manager import get_time_zone_name
+from app.exceptions.wallet_service_exceptions import WalletLimitReachedException
 from app.routers.dashboard import router as dashboard_router
 from app.services.transactions import TransactionService
 from app.services.wallets import WalletService
@@ -17,7 +22,6 @@ from app.utils.enums import FeedbackType
 from app.utils.file_utils import process_csv_file
 from app.utils.template_utils import (
     add_breadcrumb,
-    calculate_financial_summary,
     render_template,
     set_feedback,
 )
@@ -74,6 +78,24 @@ async def page_list_wallets(
     )
 
 
+def redirect_wallet_limit_reached(request: Request) -> RedirectResponse:
+    """
+    Redirects to the list wallets page with a wallet limit error.
+
+    Args:
+        request: The request object.
+
+    Returns:
+        RedirectResponse: A redirect response to the list wallets page.
+    """
+
+    set_feedback(request, FeedbackType.ERROR, "Maximum number of wallets reached")
+    return RedirectResponse(
+        router.url_path_for("page_list_wallets"),
+        status_code=status.HTTP_303_SEE_OTHER,
+    )
+
+
 async def max_wallets_reached(
     user: models.User, request: Request, service: WalletService
 ) -> RedirectResponse:
@@ -90,11 +112,7 @@ async def max_wallets_reached(
     """
 
     if await service.has_reached_wallet_limit(user):
-        set_feedback(request, FeedbackType.ERROR, "Maximum number of wallets reached")
-        return RedirectResponse(
-            router.url_path_for("page_list_wallets"),
-            status_code=status.HTTP_303_SEE_OTHER,
-        )
+        return redirect_wallet_limit_reached(request)
 
 
 @csrf_protect
@@ -159,7 +177,10 @@ async def page_create_wallet(
 
     wallet = schemas.Wallet(**form.data)
 
-    await service.create_wallet(user, wallet)
+    try:
+        await service.create_wallet(user, wallet)
+    except WalletLimitReachedException:
+        return redirect_wallet_limit_reached(request)
 
     return RedirectResponse(router.url_path_for("page_list_wallets"), status_code=302)
 
@@ -171,17 +192,24 @@ async def page_get_wallet(
     user: models.User = Depends(current_active_verified_user),
     date_start: datetime = Cookie(None),
     date_end: datetime = Cookie(None),
+    time_zone: Optional[str] = Cookie(None),
+    before: Optional[date] = None,
     transaction_service: TransactionService = Depends(TransactionService.get_instance),
-):
+):  # pylint: disable=too-many-arguments
     """
     Renders the wallet details page.
 
+    The transactions are grouped by calendar day in the time zone of the
+    user and shown in windows of settings.wallet_feed_day_limit days.
+
     Args:
         request: The request object.
         wallet_id: The ID of the wallet.
         user: The current active user.
         date_start: The start date for filtering transactions (optional).
         date_end: The end date for filtering transactions (optional).
+        time_zone: The IANA time zone of the user (optional).
+        before: Only days before this day are shown (optional).
 
     Returns:
         TemplateResponse: The rendered wallet details page.
@@ -200,26 +228,33 @@ async def page_get_wallet(
             day=last_day, hour=23, minute=59, second=59, microsecond=999999
         )
 
-    transaction_list: list[models.Transaction] = (
-        await transaction_service.get_transaction_list(
-            user, wallet_id, date_start, date_end
-        )
+    # One extra day is loaded to tell whether older days exist.
+    day_limit = settings.wallet_feed_day_limit
+    transaction_list = await transaction_service.get_transaction_feed(
+        user,
+        wallet_id,
+        date_start,
+        date_end,
+        get_time_zone_name(time_zone),
+        day_limit + 1,
+        before,
     )
 
-    financial_summary = calculate_financial_summary(transaction_list)
+    financial_summary = await transaction_service.get_financial_summary(
+        user, wallet_id, date_start, date_end
+    )
     expenses = financial_summary.expenses
     income = financial_summary.income
     total = financial_summary.total
 
-    filtered_transaction_list = [tx for tx in transaction_list if tx is not None]
-    filtered_transaction_list.sort(key=lambda x: x.information.date, reverse=True)
-
     transaction_list_grouped = [
-        {"date": date, "transactions": list(transactions)}
-        for date, transactions in groupby(
-            filtered_transaction_list, key=lambda x: x.information.date
-        )
+        {"date": day, "transactions": list(transactions)}
+        for day, transactions in groupby(transaction_list, key=attrgetter("day"))
     ]
+    next_before = None
+    if len(transaction_list_grouped) > day_limit:
+        transaction_list_grouped = transaction_list_grouped[:day_limit]
+        next_before = transaction_list_grouped[-1]["date"]
 
     return render_template(
         "pages/dashboard/page_single_wallet.html",
@@ -227,6 +262,7 @@ async def page_get_wallet(
         {
             "wallet": wallet,
             "transaction_list_grouped": transaction_list_grouped,
+            "next_before": next_before,
             "date_picker_form": schemas.DatePickerForm(request),
             "expenses": expenses,
             "income": income,
@@ -1,8 +1,12 @@
 from typing import Any, List, Tuple
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.schedulers.base import STATE_STOPPED
+from sqlalchemy.ext.asyncio import AsyncEngine
 
+from app.config import settings
 from app.tasks import process_scheduled_transactions
+from app.utils.leader_election import AdvisoryLockLeader
 
 job_registry: List[Tuple[Any, Any, dict]] = []
 
@@ -20,6 +24,40 @@ def add_jobs_to_scheduler(scheduler: AsyncIOScheduler):
     scheduler.start()
 
 
+async def run_scheduler_as_leader(
+    scheduler: AsyncIOScheduler, lock_engine: AsyncEngine
+) -> None:
+    """
+    Runs the registered jobs only while this process is the elected leader.
+
+    Every candidate process campaigns for a Postgres advisory lock. The
+    scheduler of the leader runs the jobs, the schedulers of all other
+    processes stay paused until the leader dies or loses its connection.
+
+    Args:
+        scheduler: The scheduler to run the jobs on.
+        lock_engine: The engine holding the lock, see
+            create_scheduler_lock_engine.
+    """
+
+    def on_elected():
+        if scheduler.state == STATE_STOPPED:
+            add_jobs_to_scheduler(scheduler)
+        else:
+            scheduler.resume()
+
+    def on_demoted():
+        if scheduler.running:
+            scheduler.pause()
+
+    leader = AdvisoryLockLeader(
+        lock_engine,
+        settings.scheduler_lock_id,
+        settings.scheduler_leader_retry_seconds,
+    )
+    await leader.run(on_elected, on_demoted)
+
+
 def register_job(trigger, **kwargs):
     """
     Decorator function to register a job with specified trigger and arguments.
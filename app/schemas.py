@@ -177,6 +177,14 @@ class TransactionResponse(Transaction):
     pass
 
 
+class TransactionPage(BaseModel):
+    transactions: list[TransactionResponse]
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor of the next page, None if this is the last page.",
+    )
+
+
 class ScheduledTransaction(TransactionBase):
     date_start: DateField
     frequency: FrequencyData
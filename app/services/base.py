@@ -1,14 +1,19 @@
 from abc import ABC
+from typing import Optional
 
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_session
 from app.repository import Repository
 
 
 class BaseService(ABC):
-    def __init__(self):
-        self.repository = Repository()
+    def __init__(self, repository: Optional[Repository] = None):
+        self.repository = repository or Repository()
 
     @classmethod
-    def get_instance(cls):
+    def get_instance(cls, session: AsyncSession = Depends(get_session)):
         """
         Returns an instance of the service class, suitable for use as a dependency in FastAPI.
 
@@ -18,10 +23,13 @@ class BaseService(ABC):
         integration of service classes into your API endpoints, promoting a clean separation of
         concerns and facilitating testing by enabling the injection of mock objects.
 
+        All services of a request receive the same session, so their work is
+        committed together once the request has been handled.
+
         Usage:
             @app.get("/some-endpoint")
             async def some_endpoint(service: MyService = Depends(MyService.get_instance)):
                 # Use the service instance here
                 pass
         """
-        return cls()
+        return cls(Repository(session))
@@ -1,36 +1,121 @@
-from typing import Literal, Type, Union
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Literal, Optional, Tuple, Type, Union
 
 from app import models, schemas
+from app.date_manager import get_utc_month_start
+from app.repository import Repository
 from app.services.base import BaseService
 from app.services.category import CategoryService
 from app.services.wallets import WalletService
 from app.utils.classes import RoundedDecimal
+from app.utils.enums import LoadProfile
 
 
 class BaseTransactionService(BaseService):
     def __init__(
         self,
         service_model: Type[Union[models.Transaction, models.TransactionScheduled]],
+        repository: Optional[Repository] = None,
     ):
         self.service_model = service_model
-        self.wallet_service = WalletService()
-        super().__init__()
+        super().__init__(repository)
+        self.wallet_service = WalletService(self.repository)
+
+    @staticmethod
+    def _get_summary_entry(
+        wallet_id: int,
+        information: Union[
+            models.TransactionInformation, schemas.TransactionInformation
+        ],
+        sign: int,
+    ) -> Tuple[int, datetime, Optional[int], Decimal, int]:
+        """
+        Captures the values of a transaction that the monthly summary depends on.
+
+        Args:
+            wallet_id: The ID of the wallet of the transaction.
+            information: The information of the transaction.
+            sign: 1 if the transaction is added, -1 if it is removed.
+
+        Returns:
+            The wallet ID, date, category ID, amount and sign.
+        """
+
+        return (
+            wallet_id,
+            information.date,
+            information.category_id,
+            RoundedDecimal(information.amount),
+            sign,
+        )
+
+    async def _update_monthly_summary(
+        self, entry_list: List[Tuple[int, datetime, Optional[int], Decimal, int]]
+    ) -> None:
+        """
+        Applies added and removed transactions to the monthly wallet summaries.
+
+        Entries of the same wallet, month and category are combined, so an
+        update within one month and category only changes a single row.
 
-    async def __get_transaction_by_id(self, transaction_id: int):
+        Args:
+            entry_list: Entries created by _get_summary_entry.
         """
-        Retrieves a transaction by ID.
+
+        if self.service_model is not models.Transaction:
+            return
+
+        summary_map: dict = {}
+
+        for wallet_id, date, category_id, amount, sign in entry_list:
+            if category_id is None:
+                continue
+
+            month = get_utc_month_start(date)
+            summary = summary_map.setdefault(
+                (wallet_id, month, category_id),
+                {
+                    "wallet_id": wallet_id,
+                    "month": month,
+                    "category_id": category_id,
+                    "income": Decimal(0),
+                    "expense": Decimal(0),
+                    "count": 0,
+                },
+            )
+            summary["income" if amount >= 0 else "expense"] += sign * amount
+            summary["count"] += sign
+
+        await self.repository.update_monthly_summary(
+            [
+                summary
+                for summary in summary_map.values()
+                if summary["income"] or summary["expense"] or summary["count"]
+            ]
+        )
+
+    async def __get_transaction_by_id(self, user: models.User, transaction_id: int):
+        """
+        Retrieves a transaction of a wallet of the user by ID.
 
         Args:
+            user: The user the wallet of the transaction must belong to.
             transaction_id: The ID of the transaction to retrieve.
 
         Returns:
-            The transaction if found, None otherwise.
+            The transaction.
+
+        Raises:
+            EntityNotFoundException: If the transaction does not exist or
+                belongs to a wallet of another user.
         """
 
-        return await self.repository.get(
+        return await self.repository.get_owned(
             self.service_model,
             transaction_id,
-            load_relationships_list=[self.service_model.offset_transaction],
+            user.id,
+            load_profile=LoadProfile.DETAIL,
         )
 
     async def delete_transaction(
@@ -48,31 +133,31 @@ class BaseTransactionService(BaseService):
 
         """
 
-        transaction = await self.__get_transaction_by_id(transaction_id)
-
-        wallet = await self.wallet_service.get_wallet(user, transaction.wallet_id)
+        transaction = await self.__get_transaction_by_id(user, transaction_id)
 
         amount = transaction.information.amount
+        summary_entry_list = [
+            self._get_summary_entry(transaction.wallet_id, transaction.information, -1)
+        ]
 
         if transaction.offset_transaction:
             offset_transaction = await self.__get_transaction_by_id(
-                transaction.offset_transaction.id
-            )
-            offset_wallet = await self.wallet_service.get_wallet(
-                user, offset_transaction.wallet_id
+                user, transaction.offset_transaction.id
             )
 
-            offset_wallet.balance += amount
-            await self.wallet_service.update_wallet(
-                user, schemas.WalletData(**offset_wallet.__dict__)
+            summary_entry_list.append(
+                self._get_summary_entry(
+                    offset_transaction.wallet_id, offset_transaction.information, -1
+                )
+            )
+            await self.repository.update_wallet_balance(
+                offset_transaction.wallet_id, amount
             )
             await self.repository.delete(offset_transaction)
 
-        wallet.balance -= amount
-        await self.wallet_service.update_wallet(
-            user, schemas.WalletData(**wallet.__dict__)
-        )
+        await self.repository.update_wallet_balance(transaction.wallet_id, -amount)
         await self.repository.delete(transaction)
+        await self._update_monthly_summary(summary_entry_list)
 
         return True
 
@@ -92,9 +177,10 @@ class BaseTransactionService(BaseService):
             The created transaction if successful, None otherwise.
 
         """
-        wallet = await self.wallet_service.get_wallet(user, transaction_data.wallet_id)
+        wallet_id = transaction_data.wallet_id
+        await self.wallet_service.validate_access_to_wallet(user, wallet_id)
 
-        category = await CategoryService().get_category(
+        category = await CategoryService(self.repository).get_category(
             user, transaction_data.category_id
         )
 
@@ -108,10 +194,14 @@ class BaseTransactionService(BaseService):
 
         transaction = self.service_model(
             information=db_transaction_information,
-            wallet_id=wallet.id,
+            wallet_id=wallet_id,
             scheduled_transaction_id=transaction_data.scheduled_transaction_id,
         )
 
+        summary_entry_list = [
+            self._get_summary_entry(wallet_id, db_transaction_information, 1)
+        ]
+
         if transaction_data.offset_wallet_id:
             offset_transaction = await self._handle_offset_transaction(
                 user, transaction_data
@@ -120,10 +210,22 @@ class BaseTransactionService(BaseService):
             transaction.offset_transaction = offset_transaction
             offset_transaction.offset_transaction = transaction
             await self.repository.save(offset_transaction)
+            summary_entry_list.append(
+                self._get_summary_entry(
+                    offset_transaction.wallet_id, offset_transaction.information, 1
+                )
+            )
 
-        wallet.balance += db_transaction_information.amount
+        await self.repository.save([transaction, db_transaction_information])
+        await self.repository.update_wallet_balance(
+            wallet_id, db_transaction_information.amount
+        )
+        await self._update_monthly_summary(summary_entry_list)
 
-        await self.repository.save([wallet, transaction, db_transaction_information])
+        if transaction_data.scheduled_transaction_id:
+            await self.repository.advance_scheduled_transaction(
+                transaction_data.scheduled_transaction_id, transaction_data.date
+            )
 
         return transaction
 
@@ -148,10 +250,9 @@ class BaseTransactionService(BaseService):
         if offset_wallet_id is None:
             raise ValueError("No offset_wallet_id provided")
 
-        offset_wallet = await self.wallet_service.get_wallet(user, offset_wallet_id)
+        await self.wallet_service.validate_access_to_wallet(user, offset_wallet_id)
 
         transaction_data.amount = RoundedDecimal(transaction_data.amount * -1)
-        offset_wallet.balance += transaction_data.amount
 
         db_offset_transaction_information = models.TransactionInformation()
         db_offset_transaction_information.add_attributes_from_dict(
@@ -164,7 +265,10 @@ class BaseTransactionService(BaseService):
             scheduled_transaction_id=transaction_data.scheduled_transaction_id,
         )
 
-        await self.repository.save([offset_wallet, offset_transaction])
+        await self.repository.save(offset_transaction)
+        await self.repository.update_wallet_balance(
+            offset_wallet_id, transaction_data.amount
+        )
 
         return offset_transaction
 
@@ -186,45 +290,57 @@ class BaseTransactionService(BaseService):
             The updated transaction if successful, None otherwise.
         """
 
-        transaction = await self.__get_transaction_by_id(transaction_id)
-
-        wallet = await self.wallet_service.get_wallet(user, transaction.wallet_id)
+        transaction = await self.__get_transaction_by_id(user, transaction_id)
 
         amount_updated = (
             round(transaction_information.amount, 2) - transaction.information.amount
         )
+        summary_entry_list = [
+            self._get_summary_entry(transaction.wallet_id, transaction.information, -1)
+        ]
 
         if transaction.offset_transaction:
             offset_transaction: models.Transaction = await self.__get_transaction_by_id(
-                transaction.offset_transaction.id
-            )
-            offset_wallet = await self.wallet_service.get_wallet(
-                user, offset_transaction.wallet_id
+                user, transaction.offset_transaction.id
             )
 
-            offset_wallet.balance -= amount_updated
-            await self.wallet_service.update_wallet(
-                user, schemas.WalletData(**offset_wallet.__dict__)
-            )
+            if amount_updated:
+                await self.repository.update_wallet_balance(
+                    offset_transaction.wallet_id, -amount_updated
+                )
 
             offset_information: models.TransactionInformation = (
                 offset_transaction.information
             )
+            summary_entry_list.append(
+                self._get_summary_entry(
+                    offset_transaction.wallet_id, offset_information, -1
+                )
+            )
             offset_information.add_attributes_from_dict(
                 transaction_information.model_dump()
             )
             offset_information.amount = transaction_information.amount * -1
+            summary_entry_list.append(
+                self._get_summary_entry(
+                    offset_transaction.wallet_id, offset_information, 1
+                )
+            )
 
             await self.repository.save([offset_transaction, offset_information])
 
-        wallet.balance += amount_updated
-        await self.wallet_service.update_wallet(
-            user, schemas.WalletData(**wallet.__dict__)
-        )
+        if amount_updated:
+            await self.repository.update_wallet_balance(
+                transaction.wallet_id, amount_updated
+            )
 
         transaction.add_attributes_from_dict(transaction_information.model_dump())
         information: models.TransactionInformation = transaction.information
         information.add_attributes_from_dict(transaction_information.model_dump())
+        summary_entry_list.append(
+            self._get_summary_entry(transaction.wallet_id, information, 1)
+        )
         await self.repository.save([transaction, information])
+        await self._update_monthly_summary(summary_entry_list)
 
         return transaction
@@ -1,8 +1,60 @@
 from typing import Optional
 
 from app import models
-from app.exceptions.base_service_exception import EntityAccessDeniedException
+from app.exceptions.base_service_exception import (
+    EntityAccessDeniedException,
+    EntityNotFoundException,
+)
+from app.repository import Repository
 from app.services.base import BaseService
+from app.utils.enums import LoadProfile
+from app.utils.reference_cache import reference_cache
+
+CATEGORY_CACHE_KEY = "categories"
+CATEGORY_CHOICES_CACHE_KEY = "category_choices"
+
+
+async def _load_category_map() -> dict[int, models.TransactionCategory]:
+    """
+    Loads all categories with their sections by ID for the reference cache.
+
+    Returns:
+        dict[int, models.TransactionCategory]: The detached categories.
+    """
+
+    category_list = await Repository().get_all(
+        models.TransactionCategory, load_profile=LoadProfile.REFERENCE
+    )
+    return {category.id: category for category in category_list}
+
+
+async def _load_category_choices() -> dict[str, list[tuple[int, str]]]:
+    """
+    Builds the category choices of the transaction forms for the reference cache.
+
+    Returns:
+        dict[str, list[tuple[int, str]]]: The ID and label of the categories,
+            grouped by the label of their section.
+    """
+
+    category_map = await reference_cache.get(CATEGORY_CACHE_KEY)
+
+    category_choices: dict[str, list[tuple[int, str]]] = {}
+    for category in category_map.values():
+        category_choices.setdefault(category.section.label, []).append(
+            (category.id, category.label)
+        )
+
+    return category_choices
+
+
+for cache_key, loader in (
+    (CATEGORY_CACHE_KEY, _load_category_map),
+    (CATEGORY_CHOICES_CACHE_KEY, _load_category_choices),
+):
+    reference_cache.register(
+        cache_key, loader, models.TransactionCategory, models.TransactionSection
+    )
 
 
 class CategoryService(BaseService):
@@ -12,7 +64,9 @@ class CategoryService(BaseService):
         _current_user: models.User,
     ) -> Optional[list[models.TransactionCategory]]:
         """
-        Retrieves a list of transaction categories.
+        Retrieves the list of transaction categories from the reference cache.
+
+        The categories are shared by all requests, so they must only be read.
 
         Args:
             current_user: The current active user.
@@ -21,31 +75,58 @@ class CategoryService(BaseService):
             list[TransactionCategory]: A list of transaction category objects.
         """
 
-        return await self.repository.get_all(models.TransactionCategory)
+        category_map = await reference_cache.get(CATEGORY_CACHE_KEY)
+        return list(category_map.values())
+
+    async def get_category_choices(
+        self,
+        _current_user: models.User,
+    ) -> dict[str, list[tuple[int, str]]]:
+        """
+        Retrieves the category choices of the transaction forms.
+
+        The choices are built once per cache version and shared by all
+        forms, so they must only be read.
+
+        Args:
+            current_user: The current active user.
+
+        Returns:
+            dict[str, list[tuple[int, str]]]: The ID and label of the
+                categories, grouped by the label of their section.
+        """
+
+        return await reference_cache.get(CATEGORY_CHOICES_CACHE_KEY)
 
     async def get_category(
         self, user: models.User, category_id: int
     ) -> models.TransactionCategory:
         """
-        Retrieves a transaction category by ID.
+        Retrieves a transaction category by ID from the reference cache.
 
         Args:
             current_user: The current active user.
             category_id: The ID of the transaction category to retrieve.
 
         Returns:
-            TransactionCategory: The retrieved transaction category.
+            TransactionCategory: A copy of the cached category, attached to
+                the session of the service.
 
         Raises:
+            EntityNotFoundException: If the category does not exist.
             EntityAccessDeniedException: If the user does not have access to the category.
         """
 
-        category = await self.repository.get(models.TransactionCategory, category_id)
+        category_map = await reference_cache.get(CATEGORY_CACHE_KEY)
+        category = category_map.get(category_id)
+
+        if category is None:
+            raise EntityNotFoundException(models.TransactionCategory, category_id)
 
         if category.user_id == user.id:
             raise EntityAccessDeniedException(user, category)
 
-        return category
+        return await self.repository.merge(category)
 
     # async def create_category(
     #     user: models.User, category: schemas.TransactionCategory
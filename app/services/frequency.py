@@ -1,33 +1,92 @@
 from app import models
+from app.exceptions.base_service_exception import EntityNotFoundException
+from app.repository import Repository
 from app.services.base import BaseService
+from app.utils.reference_cache import reference_cache
+
+FREQUENCY_CACHE_KEY = "frequencies"
+FREQUENCY_CHOICES_CACHE_KEY = "frequency_choices"
+
+
+async def _load_frequency_map() -> dict[int, models.Frequency]:
+    """
+    Loads all frequencies by ID for the reference cache.
+
+    Returns:
+        dict[int, models.Frequency]: The detached frequencies.
+    """
+
+    frequency_list = await Repository().get_all(models.Frequency)
+    return {frequency.id: frequency for frequency in frequency_list}
+
+
+async def _load_frequency_choices() -> list[tuple[int, str]]:
+    """
+    Builds the frequency choices of the transaction forms for the reference cache.
+
+    Returns:
+        list[tuple[int, str]]: The ID and label of the frequencies.
+    """
+
+    frequency_map = await reference_cache.get(FREQUENCY_CACHE_KEY)
+    return [(frequency.id, frequency.label) for frequency in frequency_map.values()]
+
+
+reference_cache.register(FREQUENCY_CACHE_KEY, _load_frequency_map, models.Frequency)
+reference_cache.register(
+    FREQUENCY_CHOICES_CACHE_KEY, _load_frequency_choices, models.Frequency
+)
 
 
 class FrequencyService(BaseService):
 
     async def get_frequency_list(
         self,
-    ) -> list[models.TransactionCategory]:
+    ) -> list[models.Frequency]:
         """
-        Get a list of transaction categories based on frequency.
+        Get the list of frequencies from the reference cache.
+
+        The frequencies are shared by all requests, so they must only be read.
 
         Returns:
-            Optional[list[models.TransactionCategory]]:
-                A list of transaction categories based on frequency,
-                or None if not found.
+            list[models.Frequency]: The cached frequencies.
+        """
+
+        frequency_map = await reference_cache.get(FREQUENCY_CACHE_KEY)
+        return list(frequency_map.values())
+
+    async def get_frequency_choices(self) -> list[tuple[int, str]]:
         """
+        Get the frequency choices of the transaction forms.
 
-        return await self.repository.get_all(models.Frequency)
+        The choices are built once per cache version and shared by all
+        forms, so they must only be read.
+
+        Returns:
+            list[tuple[int, str]]: The ID and label of the frequencies.
+        """
+
+        return await reference_cache.get(FREQUENCY_CHOICES_CACHE_KEY)
 
     async def get_frequency(self, frequency_id: int) -> models.Frequency:
         """
-        Get a specific transaction category by frequency ID.
+        Get a frequency by ID from the reference cache.
 
         Args:
             frequency_id (int): The ID of the frequency to retrieve.
 
         Returns:
-            Optional[models.Frequency]: The transaction category corresponding
-                 to the given frequency ID, or None if not found.
+            models.Frequency: A copy of the cached frequency, attached to the
+                session of the service.
+
+        Raises:
+            EntityNotFoundException: If the frequency does not exist.
         """
 
-        return await self.repository.get(models.Frequency, frequency_id)
+        frequency_map = await reference_cache.get(FREQUENCY_CACHE_KEY)
+        frequency = frequency_map.get(frequency_id)
+
+        if frequency is None:
+            raise EntityNotFoundException(models.Frequency, frequency_id)
+
+        return await self.repository.merge(frequency)
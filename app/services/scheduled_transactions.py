@@ -1,6 +1,10 @@
 import asyncio
+from datetime import datetime
+from typing import Optional
 
+from app.date_manager import get_today, get_tomorrow
 from app.models import Transaction, TransactionInformation, TransactionScheduled, User
+from app.repository import Repository
 from app.schemas import (
     ScheduledTransactionInformationCreate,
     ScheduledTransactionInformtionUpdate,
@@ -8,29 +12,36 @@ from app.schemas import (
 from app.services.base_transaction import BaseTransactionService
 from app.services.category import CategoryService
 from app.services.frequency import FrequencyService
-from app.services.wallets import WalletService
+from app.utils.enums import LoadProfile
 
 
 class ScheduledTransactionService(BaseTransactionService):
-    def __init__(self):
-        super().__init__(TransactionScheduled)
+    def __init__(self, repository: Optional[Repository] = None):
+        super().__init__(TransactionScheduled, repository)
 
     async def _get_scheduled_transaction_by_id(
-        self, scheduled_transaction_id: int
+        self, user: User, scheduled_transaction_id: int
     ) -> TransactionScheduled:
         """
-        Retrieves a scheduled transaction by ID.
+        Retrieves a scheduled transaction of a wallet of the user by ID.
 
         Args:
+            user: The user the wallet of the transaction must belong to.
             scheduled_transaction_id: The ID of the transaction to retrieve.
 
         Returns:
-            The scheduled transaction if found, None otherwise.
+            The scheduled transaction.
+
+        Raises:
+            EntityNotFoundException: If the scheduled transaction does not
+                exist or belongs to a wallet of another user.
         """
 
-        return await self.repository.get(
+        return await self.repository.get_owned(
             self.service_model,
             scheduled_transaction_id,
+            user.id,
+            load_profile=LoadProfile.DETAIL,
         )
 
     async def get_scheduled_transaction(
@@ -49,15 +60,7 @@ class ScheduledTransactionService(BaseTransactionService):
             The transaction with the specified ID.
         """
 
-        scheduled_transaction = await self._get_scheduled_transaction_by_id(
-            transaction_id
-        )
-
-        await self.wallet_service.validate_access_to_wallet(
-            user, scheduled_transaction.wallet_id
-        )
-
-        return scheduled_transaction
+        return await self._get_scheduled_transaction_by_id(user, transaction_id)
 
     async def get_scheduled_transaction_list(
         self,
@@ -75,12 +78,13 @@ class ScheduledTransactionService(BaseTransactionService):
             A list of transactions that match the criteria.
         """
 
-        wallet = await WalletService().get_wallet(user, wallet_id)
+        wallet = await self.wallet_service.get_wallet(user, wallet_id)
 
         return await self.repository.filter_by(
             self.service_model,
             self.service_model.wallet_id,
             wallet.id,
+            load_profile=LoadProfile.LIST,
         )
 
     async def create_scheduled_transaction(
@@ -101,11 +105,11 @@ class ScheduledTransactionService(BaseTransactionService):
         wallet_id = transaction_information.wallet_id
         wallet = await self.wallet_service.get_wallet(user, wallet_id)
 
-        category = await CategoryService().get_category(
+        category = await CategoryService(self.repository).get_category(
             user, transaction_information.category_id
         )
 
-        frequency = await FrequencyService().get_frequency(
+        frequency = await FrequencyService(self.repository).get_frequency(
             transaction_information.frequency_id
         )
 
@@ -122,6 +126,7 @@ class ScheduledTransactionService(BaseTransactionService):
             frequency=frequency,
             date_start=transaction_information.date_start,
             date_end=transaction_information.date_end,
+            next_run_at=self._get_first_run_at(transaction_information.date_start),
             information=db_transaction_information,
             wallet_id=wallet.id,
             offset_wallet_id=offset_wallet_id,
@@ -134,6 +139,26 @@ class ScheduledTransactionService(BaseTransactionService):
 
         return transaction
 
+    @staticmethod
+    def _get_first_run_at(date_start: datetime) -> datetime:
+        """
+        Returns the first run of a schedule starting at the given date.
+
+        A start in the past is not caught up, the first run is today.
+
+        Args:
+            date_start: The start date of the schedule.
+
+        Returns:
+            datetime: The later of the start date and today.
+        """
+
+        today = get_today()
+        if date_start.timestamp() < today.timestamp():
+            return today
+
+        return date_start
+
     async def update_scheduled_transaction(
         self,
         user: User,
@@ -143,6 +168,9 @@ class ScheduledTransactionService(BaseTransactionService):
         """
         Updates a scheduled transaction for a user with the provided information.
 
+        A new frequency or start date recomputes the next run like a new
+        scheduled transaction, but never back to a day that already has a run.
+
         Args:
             user: The user for whom the scheduled transaction is being updated.
             transaction_id: The ID of the scheduled transaction to update.
@@ -152,20 +180,41 @@ class ScheduledTransactionService(BaseTransactionService):
             The updated scheduled transaction if successful, None otherwise.
         """
 
-        transaction = await self._get_scheduled_transaction_by_id(transaction_id)
-
-        await self.wallet_service.validate_access_to_wallet(user, transaction.wallet_id)
+        transaction = await self._get_scheduled_transaction_by_id(user, transaction_id)
 
         if transaction.offset_wallet_id and transaction_information.offset_wallet_id:
             offset_wallet_id = transaction_information.offset_wallet_id
             await self.wallet_service.validate_access_to_wallet(user, offset_wallet_id)
 
-        transaction.frequency = await FrequencyService().get_frequency(
+        is_schedule_changed = (
+            transaction.next_run_at is None
+            or transaction.frequency_id != transaction_information.frequency_id
+            or transaction.date_start.timestamp()
+            != transaction_information.date_start.timestamp()
+        )
+
+        transaction.frequency = await FrequencyService(self.repository).get_frequency(
             transaction_information.frequency_id
         )
         transaction.date_start = transaction_information.date_start
         transaction.date_end = transaction_information.date_end
 
+        if is_schedule_changed:
+            next_run_at = self._get_first_run_at(transaction.date_start)
+
+            # A day that already has a run must not get a second one.
+            last_run_date = await self.repository.get_last_scheduled_run_date(
+                transaction.id
+            )
+            if last_run_date is not None:
+                next_run_at = max(
+                    next_run_at,
+                    get_tomorrow(last_run_date),
+                    key=lambda run_at: run_at.timestamp(),
+                )
+
+            transaction.next_run_at = next_run_at
+
         transaction.information.amount = transaction_information.amount
         transaction.information.reference = transaction_information.reference
         transaction.information.category_id = transaction_information.category_id
@@ -188,9 +237,7 @@ class ScheduledTransactionService(BaseTransactionService):
             bool: True if the scheduled transaction is successfully deleted, False otherwise.
         """
 
-        transaction = await self._get_scheduled_transaction_by_id(transaction_id)
-
-        await self.wallet_service.validate_access_to_wallet(user, transaction.wallet_id)
+        transaction = await self._get_scheduled_transaction_by_id(user, transaction_id)
 
         created_transaction_list = await self.repository.filter_by(
             Transaction,
@@ -1,20 +1,54 @@
-from datetime import datetime
-from typing import List
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional, Tuple
 
-from app import models
+from sqlalchemy import Row
+
+from app import models, schemas
+from app.repository import Repository
 from app.services.base_transaction import BaseTransactionService
+from app.utils.dataclasses_utils import FinancialSummary, TransactionListItem
+from app.utils.enums import LoadProfile
+from app.utils.pagination import decode_cursor, encode_cursor
 
 
-class TransactionService(BaseTransactionService):
-    def __init__(self):
-        super().__init__(models.Transaction)
+def _get_transaction_response(item: TransactionListItem) -> schemas.TransactionResponse:
+    """
+    Builds the response of a transaction list item without validation.
 
-    async def __get_transaction_by_id(self, transaction_id: int):
-        return await self.repository.get(
-            self.service_model,
-            transaction_id,
-            load_relationships_list=[self.service_model.offset_transaction],
-        )
+    The values come straight from the database, so validating them again
+    would only cost time.
+
+    Args:
+        item: The transaction list item.
+
+    Returns:
+        schemas.TransactionResponse: The response of the transaction.
+    """
+
+    return schemas.TransactionResponse.model_construct(
+        id=item.id,
+        wallet_id=item.wallet_id,
+        offset_transactions_id=item.offset_transactions_id,
+        information=schemas.TransactionInformationData.model_construct(
+            amount=item.amount,
+            reference=item.reference,
+            category_id=item.category_id,
+            date=item.date,
+            category=schemas.CategoryData.model_construct(
+                id=item.category_id,
+                label=item.category_label,
+                section=schemas.SectionData.model_construct(
+                    id=item.section_id, label=item.section_label
+                ),
+            ),
+        ),
+    )
+
+
+class TransactionService(BaseTransactionService):
+    def __init__(self, repository: Optional[Repository] = None):
+        super().__init__(models.Transaction, repository)
 
     async def get_transaction_list(
         self,
@@ -22,7 +56,7 @@ class TransactionService(BaseTransactionService):
         wallet_id: int,
         date_start: datetime,
         date_end: datetime,
-    ) -> List[models.Transaction]:
+    ) -> List[TransactionListItem]:
         """
         Retrieves a list of transactions for a specific user and wallet within a given date range.
 
@@ -33,14 +67,113 @@ class TransactionService(BaseTransactionService):
             date_end: Optional end date for filtering transactions.
 
         Returns:
-            A list of transactions that match the criteria.
+            A list of transactions that match the criteria, newest first.
+        """
+        await self.wallet_service.validate_access_to_wallet(user, wallet_id)
+
+        return await self.repository.get_transaction_list_items(
+            wallet_id, date_start, date_end
+        )
+
+    async def get_transaction_feed(  # pylint: disable=too-many-arguments
+        self,
+        user: models.User,
+        wallet_id: int,
+        date_start: datetime,
+        date_end: datetime,
+        time_zone: str,
+        day_limit: Optional[int] = None,
+        before_day: Optional[date] = None,
+    ) -> List[TransactionListItem]:
+        """
+        Retrieves the transactions of a wallet within a date range with
+        their calendar day, newest first.
+
+        Args:
+            user: The user for whom transactions are being retrieved.
+            wallet_id: The ID of the wallet for which transactions are being retrieved.
+            date_start: The start date for filtering transactions.
+            date_end: The end date for filtering transactions.
+            time_zone: The IANA name of the time zone of the calendar days.
+            day_limit: Optional maximum number of days to return.
+            before_day: Optional day, only earlier days are returned.
+
+        Returns:
+            The transactions, the items of a day adjacent to each other.
+        """
+        await self.wallet_service.validate_access_to_wallet(user, wallet_id)
+
+        return await self.repository.get_transaction_feed(
+            wallet_id, date_start, date_end, time_zone, day_limit, before_day
+        )
+
+    async def get_financial_summary(
+        self,
+        user: models.User,
+        wallet_id: int,
+        date_start: datetime,
+        date_end: datetime,
+    ) -> FinancialSummary:
+        """
+        Retrieves the income and expenses of a wallet within a given date range.
+
+        Args:
+            user: The user for whom the summary is being retrieved.
+            wallet_id: The ID of the wallet.
+            date_start: The start date of the period.
+            date_end: The end date of the period.
+
+        Returns:
+            FinancialSummary: The income, expenses and number of transactions.
         """
         await self.wallet_service.validate_access_to_wallet(user, wallet_id)
 
-        return await self.repository.get_transactions_from_period(
+        return await self.repository.get_financial_summary(
             wallet_id, date_start, date_end
         )
 
+    async def get_transaction_page(
+        self,
+        user: models.User,
+        wallet_id: int,
+        date_start: datetime,
+        date_end: datetime,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[schemas.TransactionResponse], Optional[str]]:
+        """
+        Retrieves one page of transactions for a specific user and wallet within a given date range.
+
+        Args:
+            user: The user for whom transactions are being retrieved.
+            wallet_id: The ID of the wallet for which transactions are being retrieved.
+            date_start: The start date for filtering transactions.
+            date_end: The end date for filtering transactions.
+            limit: The maximum number of transactions of the page.
+            cursor: Optional cursor returned with the previous page.
+
+        Returns:
+            Tuple[List[schemas.TransactionResponse], Optional[str]]: The transactions of
+                the page and the cursor of the next page, or None if there is no next page.
+
+        Raises:
+            HTTPBadRequestException: If the cursor is malformed.
+        """
+        await self.wallet_service.validate_access_to_wallet(user, wallet_id)
+
+        item_list = await self.repository.get_transaction_list_items(
+            wallet_id, date_start, date_end, limit + 1, decode_cursor(cursor)
+        )
+
+        next_cursor = None
+        if len(item_list) > limit:
+            item_list = item_list[:limit]
+            next_cursor = encode_cursor(
+                item_list[-1].date, item_list[-1].information_id
+            )
+
+        return [_get_transaction_response(item) for item in item_list], next_cursor
+
     async def get_transaction(
         self, user: models.User, transaction_id: int
     ) -> models.Transaction:
@@ -55,11 +188,176 @@ class TransactionService(BaseTransactionService):
             Transaction: The retrieved transaction.
 
         Raises:
+            EntityNotFoundException: If the transaction does not exist or
+                belongs to a wallet of another user.
+        """
+
+        return await self.repository.get_owned(
+            self.service_model,
+            transaction_id,
+            user.id,
+            load_profile=LoadProfile.DETAIL,
+        )
+
+    async def bulk_create_transactions(
+        self,
+        user: models.User,
+        wallet_id: int,
+        transaction_data_list: List[schemas.TransactionData],
+    ) -> None:
+        """
+        Creates many transactions for a wallet with batched inserts.
+
+        The information and transaction rows are written with multi-row
+        INSERT statements and the wallet balance is changed once by the sum
+        of all amounts. Transfers to offset wallets are not supported here,
+        use create_transaction for those.
+
+        Args:
+            user: The user for whom the transactions are being created.
+            wallet_id: The ID of the wallet the transactions belong to.
+            transaction_data_list: The data for the new transactions.
+
+        Returns:
             None
+
+        Raises:
+            ValueError: If one of the transactions has an offset wallet.
         """
 
-        transaction = await self.__get_transaction_by_id(transaction_id)
+        if not transaction_data_list:
+            return
+
+        if any(data.offset_wallet_id for data in transaction_data_list):
+            raise ValueError("Offset transactions can not be created in bulk")
+
+        await self.wallet_service.validate_access_to_wallet(user, wallet_id)
+
+        information_id_list = await self.repository.bulk_insert(
+            models.TransactionInformation,
+            [
+                {
+                    "amount": data.amount,
+                    "reference": data.reference,
+                    "date": data.date,
+                    "category_id": data.category_id,
+                }
+                for data in transaction_data_list
+            ],
+        )
+
+        await self.repository.bulk_insert(
+            self.service_model,
+            [
+                {
+                    "wallet_id": wallet_id,
+                    "information_id": information_id,
+                    "scheduled_transaction_id": data.scheduled_transaction_id,
+                }
+                for data, information_id in zip(
+                    transaction_data_list, information_id_list
+                )
+            ],
+        )
+
+        await self.repository.update_wallet_balance(
+            wallet_id, sum(data.amount for data in transaction_data_list)
+        )
+        await self._update_monthly_summary(
+            [
+                self._get_summary_entry(wallet_id, data, 1)
+                for data in transaction_data_list
+            ]
+        )
 
-        await self.wallet_service.validate_access_to_wallet(user, transaction.wallet_id)
+    async def _apply_scheduled_transaction_rows(
+        self, row_list: List[Row]
+    ) -> Tuple[int, Optional[int]]:
+        """
+        Applies created scheduled transactions to the wallet balances and
+        monthly summaries with one statement each.
+
+        Args:
+            row_list: The rows returned by create_due_scheduled_transactions.
+
+        Returns:
+            Tuple[int, Optional[int]]: The number of created transactions and
+                the highest executed scheduled transaction ID.
+        """
+
+        amount_map: dict[int, Decimal] = {}
+        for wallet_id, _category_id, _month, income, expense, _count, _ in row_list:
+            amount_map[wallet_id] = amount_map.get(wallet_id, 0) + income + expense
+
+        await self.repository.update_wallet_balances(amount_map)
+        await self.repository.update_monthly_summary(
+            [
+                {
+                    "wallet_id": wallet_id,
+                    "month": month,
+                    "category_id": category_id,
+                    "income": income,
+                    "expense": expense,
+                    "count": count,
+                }
+                for wallet_id, category_id, month, income, expense, count, _ in row_list
+                if category_id is not None
+            ]
+        )
+
+        last_id = max((row[-1] for row in row_list), default=None)
+        return sum(row[5] for row in row_list), last_id
+
+    async def create_scheduled_transactions(
+        self, today: datetime, shard: Optional[Tuple[int, int]] = None
+    ) -> int:
+        """
+        Creates the transactions of all due scheduled transactions at once.
+
+        The transactions are inserted by a single statement, the wallet
+        balances and monthly summaries are then updated with one statement
+        each. Ownership checks are skipped, the scheduled transactions were
+        validated when they were created. Runs missed since the last
+        execution are created as well, with their original dates.
+
+        Args:
+            today: The date of the run.
+            shard: Optional shard index and shard count to execute only the
+                scheduled transactions of one shard of the wallets.
+
+        Returns:
+            int: The number of created transactions.
+        """
+
+        row_list = await self.repository.create_due_scheduled_transactions(today, shard)
+        count, _last_id = await self._apply_scheduled_transaction_rows(row_list)
+
+        return count
+
+    async def catch_up_scheduled_transactions(
+        self, today: datetime, after_id: Optional[int], limit: int
+    ) -> Tuple[int, Optional[int]]:
+        """
+        Creates the missed transactions of one chunk of scheduled transactions.
+
+        Every run between the next run of a scheduled transaction and today
+        is created with its historical date, so a chunk may create several
+        transactions per scheduled transaction.
+
+        Args:
+            today: The date of the catch-up.
+            after_id: Only scheduled transactions with a higher ID are
+                executed, None to start with the first one.
+            limit: The maximum number of scheduled transactions of the chunk.
+
+        Returns:
+            Tuple[int, Optional[int]]: The number of created transactions and
+                the highest scheduled transaction ID of the chunk, None if
+                no scheduled transaction was due.
+        """
+
+        row_list = await self.repository.create_due_scheduled_transactions(
+            today, after_id=after_id, limit=limit
+        )
 
-        return transaction
+        return await self._apply_scheduled_transaction_rows(row_list)
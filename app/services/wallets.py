@@ -2,6 +2,7 @@ from typing import Literal
 
 from app import models, schemas
 from app.config import settings
+from app.exceptions.base_service_exception import EntityNotFoundException
 from app.exceptions.wallet_service_exceptions import (
     WalletAccessDeniedException,
     WalletLimitReachedException,
@@ -29,6 +30,45 @@ class WalletService(BaseService):
             or []
         )
 
+    async def get_wallet_choices(
+        self, current_user: models.User
+    ) -> list[tuple[int, str]]:
+        """
+        Retrieves the ID and label of all wallets of a user for form choices.
+
+        Only the columns are read, no wallet objects are loaded.
+
+        Args:
+            current_user: The current active user.
+
+        Returns:
+            list[tuple[int, str]]: The ID and label of each wallet.
+        """
+
+        row_list = await self.repository.get_wallet_rows(current_user.id)
+        return [(row.id, row.label) for row in row_list]
+
+    async def get_wallet_data_list(
+        self, current_user: models.User
+    ) -> list[schemas.WalletData]:
+        """
+        Retrieves the data of all wallets of a user for responses.
+
+        The columns are read without loading wallet objects and the responses
+        are built without validation.
+
+        Args:
+            current_user: The current active user.
+
+        Returns:
+            list[schemas.WalletData]: The data of the wallets.
+        """
+
+        return [
+            schemas.WalletData.model_construct(**row._mapping)
+            for row in await self.repository.get_wallet_rows(current_user.id)
+        ]
+
     async def __get_wallet_by_id(self, wallet_id: int):
         """
         Retrieves a wallet by its ID using the repository.
@@ -70,6 +110,9 @@ class WalletService(BaseService):
         """
         Creates a new wallet for a user based on the provided wallet data.
 
+        The wallet limit is checked in the transaction of the insert, so
+        concurrent creates cannot exceed it.
+
         Args:
             user: The user for whom the wallet is being created.
             wallet: The wallet data to create the new wallet.
@@ -81,11 +124,13 @@ class WalletService(BaseService):
             WalletLimitReachedException: If the user has reached the wallet limit.
         """
 
-        if await self.has_reached_wallet_limit(user):
+        db_wallet = models.Wallet(user_id=user.id, **wallet.model_dump())
+
+        if not await self.repository.add_wallet_within_limit(
+            db_wallet, settings.max_allowed_wallets
+        ):
             raise WalletLimitReachedException(user)
 
-        db_wallet = models.Wallet(user_id=user.id, **wallet.model_dump())
-        await self.repository.save(db_wallet)
         return db_wallet
 
     async def update_wallet(
@@ -138,9 +183,9 @@ class WalletService(BaseService):
             bool: True if the maximum number of wallets has been reached, False otherwise.
         """
 
-        wallet_list = await self.get_wallets(user)
+        wallet_count = await self.repository.count_wallets(user.id)
 
-        return len(wallet_list) >= settings.max_allowed_wallets
+        return wallet_count >= settings.max_allowed_wallets
 
     @staticmethod
     def calculate_total_balance(wallet_list: list[models.Wallet]) -> float:
@@ -162,20 +207,19 @@ class WalletService(BaseService):
         """
         Validates if the user has access to the wallet.
 
+        The wallet is looked up together with its user, without loading it.
+
         Args:
             user: The user object.
             wallet_id: The wallet ID.
 
         Raises:
-            WalletAccessDeniedException: If the user does not have access to the wallet.
+            EntityNotFoundException: If the wallet does not exist or belongs
+                to another user.
         """
 
-        wallet = await self.__get_wallet_by_id(wallet_id)
-
-        if not self.has_user_access_to_wallet(user, wallet):
-            raise WalletAccessDeniedException(user, wallet)
-
-        return
+        if not await self.repository.has_wallet_access(wallet_id, user.id):
+            raise EntityNotFoundException(models.Wallet, wallet_id)
 
     def has_user_access_to_wallet(
         self, user: models.User, wallet: models.Wallet
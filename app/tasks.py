@@ -1,95 +1,116 @@
 import csv
 from datetime import datetime
 from decimal import InvalidOperation
-from io import StringIO
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from celery import chord
 from fastapi import HTTPException
 from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 
 from app import models, schemas
 from app.celery import celery
 from app.config import settings
+from app.database import SessionLocal
 from app.date_manager import get_today
 from app.exceptions.base_service_exception import EntityNotFoundException
 from app.exceptions.wallet_service_exceptions import WalletAccessDeniedException
+from app.logger import get_logger
 from app.repository import Repository
 from app.services.email import send_transaction_import_report
 from app.services.transactions import TransactionService
+from app.utils.classes import LabelLookup
 from app.utils.dataclasses_utils import FailedImportedTransaction
-from app.utils.enums import DatabaseFilterOperator, Frequency
+from app.utils.enums import LoadProfile
+from app.utils.spool_utils import get_spool_path, remove_spooled_file
 
+logger = get_logger(__name__)
 
-async def _process_transaction_row(
+SCHEDULED_TRANSACTIONS_JOB = "scheduled_transactions"
+
+
+def _read_row_chunks(
+    reader: csv.DictReader, chunk_size: int
+) -> Iterator[List[Tuple[int, dict]]]:
+    """
+    Reads the rows of a CSV file in chunks.
+
+    Args:
+        reader: The reader of the CSV file.
+        chunk_size: The maximum number of rows per chunk.
+
+    Yields:
+        A list of tuples with the line number and the row.
+    """
+    chunk: List[Tuple[int, dict]] = []
+
+    for row in reader:
+        chunk.append((reader.line_num, row))
+
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _parse_transaction_row(
     row: dict,
     line_num: int,
     wallet_id: int,
-    user: models.User,
-    repo: Repository,
-    service: TransactionService,
-) -> Optional[FailedImportedTransaction]:
+    section_lookup: LabelLookup,
+    category_lookup_map: Dict[int, LabelLookup],
+) -> Tuple[FailedImportedTransaction, Optional[schemas.TransactionData]]:
     """
-    Processes a single row from the CSV file and creates a transaction based on its contents.
+    Validates a single row from the CSV file and resolves its section and category.
 
     Args:
         row: A dictionary representing a row from the CSV file.
+        line_num: The line number of the row in the CSV file.
         wallet_id: The wallet ID to associate with the transaction.
-        session: The database session.
-        user: The user object.
-        repo: The repository for database operations.
+        section_lookup: The lookup for transaction sections by label.
+        category_lookup_map: The lookups for transaction categories by label,
+            keyed by section ID.
 
     Returns:
-        A FailedImportedTransaction instance if the transaction fails, otherwise None.
+        The row as report entry and the transaction data. The transaction
+        data is None and the report entry has a reason if the row is invalid.
     """
     row_amount = row.get("amount")
     row_offset_wallet_id = row.get("offset_wallet_id")
 
-    amount = float(row_amount) if row_amount else None
-    offset_wallet_id = int(row_offset_wallet_id) if row_offset_wallet_id else None
-
     failed_transaction = FailedImportedTransaction(
         date=row.get("date"),
-        amount=amount,
+        amount=row_amount,
         reference=row.get("reference"),
         category=row.get("category"),
-        offset_wallet_id=offset_wallet_id,
         section=row.get("section"),
     )
 
-    section_list = await repo.filter_by(
-        models.TransactionSection,
-        models.TransactionSection.label,
-        failed_transaction.section,
-        DatabaseFilterOperator.LIKE,
-    )
+    try:
+        failed_transaction.amount = float(row_amount) if row_amount else None
+        failed_transaction.offset_wallet_id = (
+            int(row_offset_wallet_id) if row_offset_wallet_id else None
+        )
+    except ValueError as e:
+        failed_transaction.reason = f"Invalid value on line {line_num}: {e}"
+        return failed_transaction, None
 
-    section = section_list[0] if section_list else None
+    section = section_lookup.get(failed_transaction.section)
 
     if section is None:
         failed_transaction.reason = f"Section {failed_transaction.section} not found"
-        return failed_transaction
-
-    category_list = await repo.filter_by_multiple(
-        models.TransactionCategory,
-        [
-            (
-                models.TransactionCategory.label,
-                failed_transaction.category,
-                DatabaseFilterOperator.LIKE,
-            ),
-            (
-                models.TransactionCategory.section_id,
-                section.id,
-                DatabaseFilterOperator.EQUAL,
-            ),
-        ],
+        return failed_transaction, None
+
+    category_lookup = category_lookup_map.get(section.id)
+    category = (
+        category_lookup.get(failed_transaction.category) if category_lookup else None
     )
 
-    if not category_list:
+    if category is None:
         failed_transaction.reason = f"Category {row['category']} not found"
-        return failed_transaction
-
-    category = category_list[0]
+        return failed_transaction, None
 
     try:
         transaction_data = schemas.TransactionData(
@@ -110,56 +131,152 @@ async def _process_transaction_row(
             error_message = str(e)
 
         failed_transaction.reason = error_message
-        return failed_transaction
+        return failed_transaction, None
+
+    return failed_transaction, transaction_data
+
+
+async def _import_transaction_chunk(
+    row_chunk: List[Tuple[int, dict]],
+    wallet_id: int,
+    user: models.User,
+    service: TransactionService,
+    section_lookup: LabelLookup,
+    category_lookup_map: Dict[int, LabelLookup],
+) -> List[FailedImportedTransaction]:
+    """
+    Validates a chunk of CSV rows and creates their transactions.
+
+    Valid rows are inserted in bulk, transfers to an offset wallet are
+    created one by one.
+
+    Args:
+        row_chunk: The rows of the chunk with their line numbers.
+        wallet_id: The wallet ID to associate with the transactions.
+        user: The user object.
+        service: The transaction service.
+        section_lookup: The lookup for transaction sections by label.
+        category_lookup_map: The lookups for transaction categories by section ID.
+
+    Returns:
+        A list of FailedImportedTransaction instances for the rows that failed.
+    """
+    failed_transaction_list: List[FailedImportedTransaction] = []
+    bulk_transaction_list: List[
+        Tuple[FailedImportedTransaction, schemas.TransactionData]
+    ] = []
+
+    for line_num, row in row_chunk:
+        failed_transaction, transaction_data = _parse_transaction_row(
+            row, line_num, wallet_id, section_lookup, category_lookup_map
+        )
+
+        if transaction_data is None:
+            failed_transaction_list.append(failed_transaction)
+            continue
+
+        if transaction_data.offset_wallet_id is None:
+            bulk_transaction_list.append((failed_transaction, transaction_data))
+            continue
+
+        try:
+            await service.create_transaction(user, transaction_data)
+        except (EntityNotFoundException, WalletAccessDeniedException) as e:
+            failed_transaction.reason = e.message
+            failed_transaction_list.append(failed_transaction)
 
     try:
-        await service.create_transaction(
+        await service.bulk_create_transactions(
             user,
-            transaction_data,
+            wallet_id,
+            [transaction_data for _, transaction_data in bulk_transaction_list],
         )
     except (EntityNotFoundException, WalletAccessDeniedException) as e:
-        failed_transaction.reason = e.message
-        return failed_transaction
+        for failed_transaction, _ in bulk_transaction_list:
+            failed_transaction.reason = e.message
+            failed_transaction_list.append(failed_transaction)
 
-    return None
+    return failed_transaction_list
+
+
+async def _import_transactions_from_reader(
+    reader: csv.DictReader, user_id: int, wallet_id: int
+) -> Tuple[models.User, List[FailedImportedTransaction]]:
+    """
+    Imports the transactions of a CSV reader in one unit of work.
+
+    Args:
+        reader: A DictReader object containing transaction rows from a CSV file.
+        user_id: The ID of the user for whom the transactions are being imported.
+        wallet_id: The ID of the wallet where transactions will be recorded.
+
+    Returns:
+        The user and a list of the rows that failed to import.
+    """
+    async with SessionLocal.begin() as session:
+        repo = Repository(session)
+        # TODO: Use user service here:
+        user = await repo.get(models.User, user_id)
+
+        service = TransactionService(repo)
+        failed_transaction_list: List[FailedImportedTransaction] = []
+
+        section_lookup = LabelLookup(await repo.get_all(models.TransactionSection))
+
+        category_list_map: Dict[int, list] = {}
+        for category in await repo.get_all(
+            models.TransactionCategory, load_profile=LoadProfile.IMPORT
+        ):
+            category_list_map.setdefault(category.section_id, []).append(category)
+
+        category_lookup_map = {
+            section_id: LabelLookup(category_list)
+            for section_id, category_list in category_list_map.items()
+        }
+
+        for row_chunk in _read_row_chunks(reader, settings.batch_size):
+            failed_transaction_list += await _import_transaction_chunk(
+                row_chunk,
+                wallet_id,
+                user,
+                service,
+                section_lookup,
+                category_lookup_map,
+            )
+
+    return user, failed_transaction_list
 
 
 @celery.task
 async def import_transactions_from_csv(
-    user_id: int, wallet_id: int, contents: bytes
+    user_id: int, wallet_id: int, file_name: str
 ) -> None:
     """
-    Imports transactions for a user from a CSV file.
+    Imports transactions for a user from a spooled CSV file.
+
+    The file is read as a stream and the rows are validated and inserted in
+    chunks of settings.batch_size, so only one chunk is held in memory.
+    Sections and categories are resolved from lookups built once per import.
+    The spooled file is removed afterwards.
 
     Args:
-        user: The user for whom the transactions are being imported.
+        user_id: The ID of the user for whom the transactions are being imported.
         wallet_id: The ID of the wallet where transactions will be recorded.
-        reader: A DictReader object containing transaction rows from a CSV file.
+        file_name: The name of the CSV file in the spool directory.
 
     Returns:
         None. Transactions are imported to the database, and any failures are handled appropriately.
     """
     try:
-        contents_str = contents.decode()
-        csv_file = StringIO(contents_str)
+        with open(get_spool_path(file_name), encoding="utf-8", newline="") as csv_file:
+            reader = csv.DictReader(csv_file, delimiter=";")
+            user, failed_transaction_list = await _import_transactions_from_reader(
+                reader, user_id, wallet_id
+            )
     except UnicodeDecodeError as e:
         raise HTTPException(status_code=400, detail=e.reason) from e
-
-    reader = csv.DictReader(csv_file, delimiter=";")
-
-    repo = Repository()
-    # TODO: Use user service here:
-    user = await repo.get(models.User, user_id)
-
-    service = TransactionService()
-    failed_transaction_list: List[FailedImportedTransaction] = []
-
-    for row in reader:
-        failed_transaction = await _process_transaction_row(
-            row, reader.line_num, wallet_id, user, repo, service
-        )
-        if failed_transaction:
-            failed_transaction_list.append(failed_transaction)
+    finally:
+        remove_spooled_file(file_name)
 
     if settings.environment != "test":
         await send_transaction_import_report(
@@ -169,65 +286,164 @@ async def import_transactions_from_csv(
     return None
 
 
-async def _create_transaction(
-    today: datetime,
-    service: TransactionService,
-    repo: Repository,
-    scheduled_transaction: models.TransactionScheduled,
-):
-    """
-    Create a transaction based on a scheduled transaction.
-
-        Args:
-            session: The database session.
-            today: The current date.
-            service: The transaction service.
-            repo: The repository for database operations.
-            scheduled_transaction:
-                The scheduled transaction to create a transaction from.
-    """
-
-    user = await repo.get(models.User, scheduled_transaction.wallet.user_id)
-
-    information: models.TransactionInformation = scheduled_transaction.information
-    new_transaction = schemas.TransactionData(
-        wallet_id=scheduled_transaction.wallet.id,
-        amount=information.amount,
-        reference=information.reference,
-        date=today,
-        category_id=information.category_id,
-        scheduled_transaction_id=scheduled_transaction.id,
-    )
+@celery.task
+async def process_scheduled_transaction_shard(
+    shard_index: int, shard_count: int, today: str
+) -> dict:
+    """
+    Process the due scheduled transactions of one shard of the wallets
+    in its own database transaction.
 
-    await service.create_transaction(user, new_transaction)
+    Args:
+        shard_index: The index of the shard.
+        shard_count: The number of shards.
+        today: The date of the run in ISO format, shared by all shards.
+
+    Returns:
+        dict: The shard index, the number of created transactions and the
+            error message if the shard failed.
+    """
+
+    shard_result = {"shard": shard_index, "created": 0, "error": None}
+
+    try:
+        async with SessionLocal.begin() as session:
+            service = TransactionService(Repository(session))
+            shard_result["created"] = await service.create_scheduled_transactions(
+                datetime.fromisoformat(today), (shard_index, shard_count)
+            )
+    except (OSError, SQLAlchemyError) as e:
+        # A refused or broken connection raises an OSError, which would
+        # otherwise fail the whole chord instead of this shard.
+        logger.exception("Scheduled transaction shard %s failed", shard_index)
+        shard_result["error"] = str(e)
+
+    return shard_result
 
 
 @celery.task
-async def process_scheduled_transactions():
+def summarize_scheduled_transaction_shards(shard_result_list: List[dict]) -> dict:
     """
-    Process scheduled transactions by fetching them based on frequency and
-    creating corresponding transactions.
+    Aggregate the results of all shards of a scheduled transaction run.
+
+    Args:
+        shard_result_list: The results of process_scheduled_transaction_shard.
+
+    Returns:
+        dict: The number of created transactions and the failed shards.
     """
 
-    repo = Repository()
-    service = TransactionService()
-    today = get_today()
+    created = sum(shard_result["created"] for shard_result in shard_result_list)
+    failed_shard_list = [
+        shard_result["shard"]
+        for shard_result in shard_result_list
+        if shard_result["error"] is not None
+    ]
+
+    logger.info(
+        "Scheduled transaction run created %s transactions in %s shards",
+        created,
+        len(shard_result_list),
+    )
+    if failed_shard_list:
+        logger.error("Scheduled transaction shards failed: %s", failed_shard_list)
+
+    return {"created": created, "failed_shards": failed_shard_list}
 
-    scheduled_transaction_list = []
 
-    for frequency in Frequency.get_list():
-        transactions = await repo.get_scheduled_transactions_by_frequency(
-            frequency.value, today
-        )
-        scheduled_transaction_list += transactions
+@celery.task
+async def record_scheduled_transaction_run(summary: dict, today: str) -> dict:
+    """
+    Record the run of the scheduled transactions as the new watermark,
+    unless a shard failed.
 
-    if not scheduled_transaction_list:
-        return
+    Args:
+        summary: The result of summarize_scheduled_transaction_shards.
+        today: The date of the run in ISO format.
+
+    Returns:
+        dict: The unchanged summary.
+    """
 
-    for scheduled in scheduled_transaction_list:
-        await _create_transaction(
-            repo=repo,
-            today=today,
-            service=service,
-            scheduled_transaction=scheduled,
+    if not summary["failed_shards"]:
+        await Repository().set_job_watermark(
+            SCHEDULED_TRANSACTIONS_JOB, datetime.fromisoformat(today)
         )
+
+    return summary
+
+
+@celery.task
+async def process_scheduled_transactions() -> str:
+    """
+    Process scheduled transactions by splitting the wallets into shards,
+    each processed by its own task, and aggregating the shard results.
+
+    Returns:
+        str: The ID of the result of the chord, which is ready once the run
+            is recorded.
+    """
+
+    shard_count = settings.scheduled_transaction_shard_count
+    today = get_today().isoformat()
+
+    chord_result = chord(
+        process_scheduled_transaction_shard.s(shard_index, shard_count, today)
+        for shard_index in range(shard_count)
+    )(
+        summarize_scheduled_transaction_shards.s()
+        | record_scheduled_transaction_run.s(today)
+    )
+
+    return chord_result.id
+
+
+async def catch_up_missed_scheduled_transactions(today: datetime) -> int:
+    """
+    Create all runs of scheduled transactions missed up to today.
+
+    The scheduled transactions are processed in chunks of settings.batch_size
+    in the order of their IDs, each chunk in its own database transaction,
+    so a failure keeps the chunks already caught up. Once all chunks are
+    done, today is recorded as the watermark of the job.
+
+    Args:
+        today: The date to catch up to.
+
+    Returns:
+        int: The number of created transactions.
+    """
+
+    watermark = await Repository().get_job_watermark(SCHEDULED_TRANSACTIONS_JOB)
+    logger.info("Catching up scheduled transactions since %s", watermark)
+
+    created = 0
+    last_id: Optional[int] = None
+
+    while True:
+        async with SessionLocal.begin() as session:
+            service = TransactionService(Repository(session))
+            chunk_created, last_id = await service.catch_up_scheduled_transactions(
+                today, last_id, settings.batch_size
+            )
+
+        created += chunk_created
+        if last_id is None:
+            break
+
+    await Repository().set_job_watermark(SCHEDULED_TRANSACTIONS_JOB, today)
+    logger.info("Scheduled transaction catch-up created %s transactions", created)
+
+    return created
+
+
+@celery.task
+async def catch_up_scheduled_transactions() -> int:
+    """
+    Create all runs of scheduled transactions missed up to today.
+
+    Returns:
+        int: The number of created transactions.
+    """
+
+    return await catch_up_missed_scheduled_transactions(get_today())
@@ -2,7 +2,7 @@ import csv
 from dataclasses import fields
 from decimal import Decimal
 from io import StringIO
-from typing import List
+from typing import List, Optional
 
 from pydantic_core import core_schema
 
@@ -132,3 +132,47 @@ class TransactionCSV:
         """
         with open(file_path, "w", encoding="utf-8") as file:
             file.write(self.generate_csv_content())
+
+
+class LabelLookup:
+    """
+    Resolves entities by their label in memory.
+
+    A label matches case-insensitively, preferring an exact match over the
+    first entity whose label contains it, the same way an ILIKE '%label%'
+    filter would. Resolved labels are cached, so repeated lookups are cheap.
+
+    Example:
+        lookup = LabelLookup(section_list)
+        section = lookup.get("household")
+    """
+
+    def __init__(self, entity_list: list):
+        self.entity_list = entity_list
+        self._cache: dict = {}
+
+    def get(self, label: Optional[str]):
+        """
+        Returns the entity matching the label.
+
+        Args:
+            label: The label to look up.
+
+        Returns:
+            The matching entity or None if no entity matches.
+        """
+        if not label:
+            return None
+
+        key = label.strip().lower()
+
+        if key not in self._cache:
+            self._cache[key] = next(
+                (entity for entity in self.entity_list if entity.label.lower() == key),
+                None,
+            ) or next(
+                (entity for entity in self.entity_list if key in entity.label.lower()),
+                None,
+            )
+
+        return self._cache[key]
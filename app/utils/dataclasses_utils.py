@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Optional, Union
 
 from fastapi import Request
@@ -34,13 +36,35 @@ class FailedImportedTransaction(ImportedTransaction):
 class FinancialSummary:
     expenses: int = 0
     income: int = 0
+    count: int = 0
 
     @property
     def total(self) -> int:
         """
-        Calculates the total amount by subtracting expenses from income.
+        Calculates the total amount by adding the negative expenses to the income.
 
         Returns:
             The total amount.
         """
-        return self.income - self.expenses
+        return self.income + self.expenses
+
+
+@dataclass(slots=True)
+class TransactionListItem:
+    """
+    A transaction as shown in lists, read from the columns of a single query.
+    """
+
+    id: int
+    wallet_id: int
+    offset_transactions_id: Optional[int]
+    information_id: int
+    date: datetime
+    amount: Decimal
+    reference: str
+    category_id: Optional[int]
+    category_label: Optional[str]
+    section_id: Optional[int]
+    section_label: Optional[str]
+    offset_wallet_label: Optional[str]
+    day: Optional[date] = None
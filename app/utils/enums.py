@@ -41,6 +41,9 @@ class DatabaseFilterOperator(ExtendedEnum):
     GREATER_THAN_OR_EQUAL = ">="
     LIKE = "LIKE"
     IS_NOT = "!="
+    IN = "IN"
+    NOT_IN = "NOT IN"
+    BETWEEN = "BETWEEN"
 
 
 class Frequency(ExtendedEnum):
@@ -48,3 +51,11 @@ class Frequency(ExtendedEnum):
     WEEKLY = 3
     MONTHLY = 4
     YEARLY = 5
+
+
+class LoadProfile(ExtendedEnum):
+    LIST = "list"
+    DETAIL = "detail"
+    SCHEDULER = "scheduler"
+    IMPORT = "import"
+    REFERENCE = "reference"
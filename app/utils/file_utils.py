@@ -3,6 +3,7 @@ from fastapi import HTTPException, UploadFile
 from app.exceptions.http_exceptions import HTTPBadRequestException
 from app.models import User
 from app.tasks import import_transactions_from_csv
+from app.utils.spool_utils import remove_spooled_file, spool_upload
 
 
 async def process_csv_file(
@@ -13,6 +14,10 @@ async def process_csv_file(
     """
     Processes a CSV file upload.
 
+    The file is streamed to the spool directory and only its name is passed
+    to the import task, so the content never has to fit into memory or the
+    message broker.
+
     Args:
         wallet_id: The ID of the wallet.
         file: The uploaded CSV file.
@@ -25,9 +30,11 @@ async def process_csv_file(
     """
     if not file.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="Invalid file type")
-    contents = await file.read()
 
-    if not contents:
+    file_name, size = await spool_upload(file)
+
+    if not size:
+        remove_spooled_file(file_name)
         raise HTTPBadRequestException("File is empty")
 
-    import_transactions_from_csv.delay(current_user.id, wallet_id, contents)
+    import_transactions_from_csv.delay(current_user.id, wallet_id, file_name)
@@ -0,0 +1,108 @@
+import asyncio
+from typing import Callable
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AdvisoryLockLeader:
+    """
+    Elects a single leader among processes with a Postgres advisory lock.
+
+    The lock is held by a dedicated connection for as long as the process
+    leads. If the process dies or its connection breaks, Postgres releases
+    the lock and another process takes over on its next attempt. The lock is
+    bound to a server session, so the engine must not point to PgBouncer in
+    transaction mode.
+    """
+
+    def __init__(self, db_engine: AsyncEngine, lock_id: int, retry_seconds: float):
+        """
+        Initializes the leader election.
+
+        Args:
+            db_engine: The engine of the database holding the lock.
+            lock_id: The advisory lock key shared by all candidates.
+            retry_seconds: The interval of lock attempts and, while leading,
+                of connection health checks.
+        """
+
+        self.db_engine = db_engine
+        self.lock_id = lock_id
+        self.retry_seconds = retry_seconds
+
+    async def run(
+        self, on_elected: Callable[[], None], on_demoted: Callable[[], None]
+    ) -> None:
+        """
+        Campaigns for the leadership until cancelled.
+
+        Args:
+            on_elected: Called when this process becomes the leader.
+            on_demoted: Called when this process stops being the leader.
+        """
+
+        while True:
+            try:
+                async with self.db_engine.connect() as connection:
+                    await connection.execution_options(isolation_level="AUTOCOMMIT")
+                    if await self._try_lock(connection):
+                        await self._lead(connection, on_elected, on_demoted)
+            except (OSError, SQLAlchemyError):
+                logger.exception("Leader election failed, retrying")
+
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _try_lock(self, connection: AsyncConnection) -> bool:
+        """
+        Tries to take the advisory lock without waiting.
+
+        Args:
+            connection: The connection to hold the lock on.
+
+        Returns:
+            bool: True if the lock was taken.
+        """
+
+        result = await connection.execute(
+            select(func.pg_try_advisory_lock(self.lock_id))
+        )
+        return bool(result.scalar_one())
+
+    async def _lead(
+        self,
+        connection: AsyncConnection,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+    ) -> None:
+        """
+        Leads until the connection holding the lock breaks or the task is cancelled.
+
+        Args:
+            connection: The connection holding the lock.
+            on_elected: Called when the leadership starts.
+            on_demoted: Called when the leadership ends.
+        """
+
+        logger.info("Elected as leader for lock %s", self.lock_id)
+        on_elected()
+
+        try:
+            while True:
+                await asyncio.sleep(self.retry_seconds)
+                await connection.execute(select(1))
+        finally:
+            on_demoted()
+            logger.info("Stepped down as leader for lock %s", self.lock_id)
+
+            try:
+                await connection.execute(select(func.pg_advisory_unlock(self.lock_id)))
+            except (OSError, SQLAlchemyError):
+                # A connection that can not unlock is closed instead, which
+                # releases the lock on the server as well.
+                await connection.invalidate()
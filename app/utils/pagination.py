@@ -0,0 +1,49 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.exceptions.http_exceptions import HTTPBadRequestException
+
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(date: datetime, entity_id: int) -> str:
+    """
+    Encodes a keyset position into an opaque cursor string.
+
+    Args:
+        date: The date of the last entry of a page.
+        entity_id: The ID of the last entry of a page.
+
+    Returns:
+        str: The URL safe cursor.
+    """
+
+    raw_cursor = f"{date.isoformat()}|{entity_id}"
+    return base64.urlsafe_b64encode(raw_cursor.encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """
+    Decodes a cursor string created by encode_cursor.
+
+    Args:
+        cursor: The cursor string.
+
+    Returns:
+        Optional[Cursor]: The date and ID of the keyset position or None if no cursor was given.
+
+    Raises:
+        HTTPBadRequestException: If the cursor is malformed.
+    """
+
+    if not cursor:
+        return None
+
+    try:
+        raw_cursor = base64.urlsafe_b64decode(cursor.encode()).decode()
+        raw_date, raw_id = raw_cursor.rsplit("|", 1)
+        return datetime.fromisoformat(raw_date), int(raw_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPBadRequestException("Invalid cursor") from e
@@ -0,0 +1,170 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+_QUERY_START_KEY = "query_stats_start_time"
+
+_current_query_stats: ContextVar[Optional["QueryStats"]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+@dataclass
+class QueryStats:
+    scope: str
+    query_count: int = 0
+    db_time: float = 0.0
+    row_count: int = 0
+    statement_counter: Counter = field(default_factory=Counter)
+
+    def get_repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Returns the statements that were executed at least threshold times.
+
+        The same statement running again and again within one scope is the
+        signature of an N+1 pattern, for example a lazy or selectin load per
+        row of a list.
+
+        Args:
+            threshold: The minimum number of executions.
+
+        Returns:
+            list[tuple[str, int]]: The statements and their execution count.
+        """
+
+        return [
+            (statement, count)
+            for statement, count in self.statement_counter.most_common()
+            if count >= threshold
+        ]
+
+    def get_server_timing(self) -> str:
+        """
+        Formats the stats as a Server-Timing header value.
+
+        Returns:
+            str: The header value.
+        """
+
+        return (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries, '
+            f'{self.row_count} rows"'
+        )
+
+    def log(self) -> None:
+        """
+        Logs the stats of the scope.
+
+        Scopes that exceed the query count threshold or repeat a statement
+        more often than the N+1 threshold are logged as warnings, all other
+        scopes on debug level.
+        """
+
+        repeated_statement_list = self.get_repeated_statements(
+            settings.query_stats_repeated_threshold
+        )
+        log_data = {
+            "scope": self.scope,
+            "query_count": self.query_count,
+            "db_time_ms": round(self.db_time * 1000, 1),
+            "row_count": self.row_count,
+            "repeated_statement_count": len(repeated_statement_list),
+        }
+        message = " ".join(f"{key}={value}" for key, value in log_data.items())
+
+        if (
+            self.query_count < settings.query_stats_count_threshold
+            and not repeated_statement_list
+        ):
+            logger.debug("db_stats %s", message, extra=log_data)
+            return
+
+        logger.warning("db_stats %s", message, extra=log_data)
+
+        for statement, count in repeated_statement_list:
+            logger.warning(
+                "db_stats_repeated scope=%s count=%s statement=%s",
+                self.scope,
+                count,
+                " ".join(statement.split()),
+            )
+
+
+@contextmanager
+def track_queries(scope: str) -> Iterator[QueryStats]:
+    """
+    Collects the stats of all queries executed within the context.
+
+    Args:
+        scope: Name of the tracked unit of work, like the request path or
+            the Celery task name.
+
+    Yields:
+        QueryStats: The stats, updated while the context is active.
+    """
+
+    query_stats = QueryStats(scope)
+    token = _current_query_stats.set(query_stats)
+    try:
+        yield query_stats
+    finally:
+        _current_query_stats.reset(token)
+
+
+def _before_cursor_execute(
+    conn, _cursor, _statement, _parameters, _context, _executemany
+):  # pylint: disable=too-many-arguments
+    if _current_query_stats.get() is None:
+        return
+
+    conn.info.setdefault(_QUERY_START_KEY, []).append(perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, _parameters, _context, _executemany
+):  # pylint: disable=too-many-arguments
+    query_stats = _current_query_stats.get()
+    start_time_list = conn.info.get(_QUERY_START_KEY)
+
+    if query_stats is None or not start_time_list:
+        return
+
+    query_stats.query_count += 1
+    query_stats.db_time += perf_counter() - start_time_list.pop()
+    query_stats.row_count += max(cursor.rowcount, 0)
+    query_stats.statement_counter[statement] += 1
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    start_time_list = connection.info.get(_QUERY_START_KEY) if connection else None
+
+    if start_time_list:
+        start_time_list.pop()
+
+
+def register_query_stats(engine: Engine) -> None:
+    """
+    Registers the query stats listeners on an engine.
+
+    Args:
+        engine: The synchronous engine, use sync_engine for async engines.
+    """
+
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
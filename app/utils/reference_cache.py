@@ -0,0 +1,150 @@
+import asyncio
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Awaitable, Callable, Optional, Type
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    version: int
+    expires_at: float
+
+
+class ReferenceCache:
+    """
+    Per process cache of reference data, like categories and frequencies.
+
+    Every key has a loader and a version. Invalidating a key bumps its
+    version, so an entry loaded before the invalidation is never served
+    again, not even if its load finishes afterwards. Entries also expire
+    after the TTL, which bounds how long a change made by another process
+    stays invisible.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._loader_map: dict[str, Loader] = {}
+        self._version_map: dict[str, int] = {}
+        self._entry_map: dict[str, CacheEntry] = {}
+        self._lock_map: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Lock]
+        ] = WeakKeyDictionary()
+
+    def register(self, key: str, loader: Loader, *model_list: Type) -> None:
+        """
+        Registers the loader of a key.
+
+        Inserts, updates and deletes of the given models through the ORM
+        invalidate the key.
+
+        Args:
+            key: The cache key.
+            loader: Coroutine function that loads the value from the database.
+            model_list: The models the value is built from.
+        """
+
+        self._loader_map[key] = loader
+        self._version_map.setdefault(key, 0)
+
+        def invalidate_key(*_args) -> None:
+            self.invalidate(key)
+
+        for model in model_list:
+            for event_name in ("after_insert", "after_update", "after_delete"):
+                event.listen(model, event_name, invalidate_key)
+
+    def _get_fresh_entry(self, key: str) -> Optional[CacheEntry]:
+        """
+        Returns the entry of a key if it is neither invalidated nor expired.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            Optional[CacheEntry]: The entry, None if it has to be loaded.
+        """
+
+        entry = self._entry_map.get(key)
+
+        if (
+            entry is None
+            or entry.version != self._version_map[key]
+            or entry.expires_at <= monotonic()
+        ):
+            return None
+
+        return entry
+
+    async def get(self, key: str) -> Any:
+        """
+        Returns the value of a key, loading it if needed.
+
+        Concurrent misses of the same key on the same event loop wait for
+        a single load.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            Any: The cached value.
+        """
+
+        entry = self._get_fresh_entry(key)
+        if entry is not None:
+            return entry.value
+
+        loop_lock_map = self._lock_map.setdefault(asyncio.get_running_loop(), {})
+        lock = loop_lock_map.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._get_fresh_entry(key)
+            if entry is not None:
+                return entry.value
+
+            version = self._version_map[key]
+            value = await self._loader_map[key]()
+
+            if self.ttl_seconds > 0 and version == self._version_map[key]:
+                self._entry_map[key] = CacheEntry(
+                    value, version, monotonic() + self.ttl_seconds
+                )
+
+        return value
+
+    def invalidate(self, *key_list: str) -> None:
+        """
+        Invalidates keys, all keys if none are given.
+
+        Args:
+            key_list: The cache keys.
+        """
+
+        for key in key_list or tuple(self._version_map):
+            self._version_map[key] = self._version_map.get(key, 0) + 1
+            self._entry_map.pop(key, None)
+
+    async def warm_up(self) -> None:
+        """
+        Loads all registered keys, so the first requests find them cached.
+
+        A failed load is logged and left to the first request.
+        """
+
+        for key in self._loader_map:
+            try:
+                await self.get(key)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Warming up the reference cache %s failed", key)
+
+
+reference_cache = ReferenceCache(settings.reference_cache_ttl_seconds)
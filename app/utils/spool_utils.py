@@ -0,0 +1,65 @@
+import os
+import shutil
+import uuid
+from contextlib import suppress
+from pathlib import Path
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+
+def get_spool_path(file_name: str) -> Path:
+    """
+    Returns the path of a spooled file.
+
+    Args:
+        file_name: The name of the spooled file.
+
+    Returns:
+        Path: The path of the file inside the spool directory.
+    """
+
+    return Path(settings.import_spool_dir) / Path(file_name).name
+
+
+async def spool_upload(file: UploadFile) -> tuple[str, int]:
+    """
+    Streams an uploaded file in chunks to the spool directory.
+
+    Only settings.upload_chunk_size bytes are held in memory at a time.
+
+    Args:
+        file: The uploaded file.
+
+    Returns:
+        tuple[str, int]: The name of the spooled file and its size in bytes.
+    """
+
+    file_name = f"{uuid.uuid4().hex}{Path(file.filename).suffix}"
+    spool_path = get_spool_path(file_name)
+    spool_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(spool_path, "wb") as spool_file:
+        await run_in_threadpool(
+            shutil.copyfileobj, file.file, spool_file, settings.upload_chunk_size
+        )
+        size = spool_file.tell()
+
+    return file_name, size
+
+
+def remove_spooled_file(file_name: str) -> None:
+    """
+    Removes a file from the spool directory, if it still exists.
+
+    Args:
+        file_name: The name of the spooled file.
+
+    Returns:
+        None
+    """
+
+    with suppress(OSError):
+        os.remove(get_spool_path(file_name))
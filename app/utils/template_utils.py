@@ -1,4 +1,4 @@
-from collections import defaultdict
+import asyncio
 from typing import List, Optional, Type, Union
 
 from fastapi import Request
@@ -130,26 +130,6 @@ def render_transaction_form_template(
     )
 
 
-def group_categories_by_section(categorie_list: list[schemas.CategoryData]):
-    """Group categories by section.
-
-    Args:
-        categorie_list: A list of category data.
-
-    Returns:
-        dict:
-            A dictionary where the keys are section labels and
-            the values are lists of category IDs and labels.
-
-    Raises:
-        None
-    """
-    grouped_data = defaultdict(list)
-    for item in categorie_list:
-        grouped_data[item.section.label].append((item.id, item.label))
-    return grouped_data
-
-
 def add_breadcrumb(request: Request, label: str, url: Union[str, None]):
     """Add a breadcrumb to the request state.
 
@@ -182,6 +162,7 @@ def calculate_financial_summary(
     summary = FinancialSummary()
 
     for transaction in transaction_list:
+        summary.count += 1
 
         if transaction.information.amount < 0:
             summary.expenses += transaction.information.amount
@@ -217,20 +198,15 @@ async def populate_transaction_form_wallet_choices(
     Returns:
         None
     """
-    service = WalletService()
-    wallet_list = await service.get_wallets(user)
-
-    if wallet_list is None:
-        return None
-
-    wallet_list_length = len(wallet_list)
+    user_wallet_choices = await WalletService().get_wallet_choices(user)
+    wallet_list_length = len(user_wallet_choices)
 
     wallet_choices = (
         [(0, first_select_label)]
         + [
-            (wallet.id, wallet.label)
-            for wallet in wallet_list
-            if wallet is not None and wallet.id != wallet_id
+            (choice_wallet_id, label)
+            for choice_wallet_id, label in user_wallet_choices
+            if choice_wallet_id != wallet_id
         ]
         if wallet_list_length > 1
         else [(0, "No other wallets found")]
@@ -262,19 +238,7 @@ async def populate_transaction_form_category_choices(
     Returns:
         None
     """
-    category_service = CategoryService()
-    category_list = await category_service.get_categories(user) or []
-    category_data_list = [
-        schemas.CategoryData(
-            id=category.id,
-            label=category.label,
-            section=schemas.SectionData(
-                id=category.section_id, label=category.section.label
-            ),
-        )
-        for category in category_list
-    ]
-    form.category_id.choices = group_categories_by_section(category_data_list)
+    form.category_id.choices = await CategoryService().get_category_choices(user)
 
 
 async def populate_transaction_form_frequency_choices(
@@ -297,12 +261,7 @@ async def populate_transaction_form_frequency_choices(
     Returns:
         None
     """
-    service = FrequencyService()
-    frequency_list = await service.get_frequency_list() or []
-
-    choices = [(frequency.id, frequency.label) for frequency in frequency_list]
-
-    form.frequency_id.choices = choices
+    form.frequency_id.choices = await FrequencyService().get_frequency_choices()
 
 
 async def populate_transaction_form_choices(
@@ -321,6 +280,10 @@ async def populate_transaction_form_choices(
     """
     Populates the choices in the transaction form.
 
+    The choice loaders fill different fields and run concurrently, each on
+    its own session. Categories and frequencies come prebuilt from the
+    reference cache, so only the wallets are usually read.
+
     Args:
         wallet_id: The ID of the wallet.
         user: The current active user.
@@ -331,7 +294,12 @@ async def populate_transaction_form_choices(
         None
     """
 
-    await populate_transaction_form_category_choices(user, form)
+    choice_loader_list = [
+        populate_transaction_form_category_choices(user, form),
+        populate_transaction_form_wallet_choices(
+            wallet_id, user, form, first_select_label
+        ),
+    ]
 
     if isinstance(
         form,
@@ -340,8 +308,6 @@ async def populate_transaction_form_choices(
             schemas.UpdateScheduledTransactionForm,
         ),
     ):
-        await populate_transaction_form_frequency_choices(form)
+        choice_loader_list.append(populate_transaction_form_frequency_choices(form))
 
-    await populate_transaction_form_wallet_choices(
-        wallet_id, user, form, first_select_label
-    )
+    await asyncio.gather(*choice_loader_list)
@@ -5,11 +5,12 @@ from starlette.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
     HTTP_204_NO_CONTENT,
+    HTTP_400_BAD_REQUEST,
     HTTP_404_NOT_FOUND,
 )
 
 from app import models, schemas
-from app.date_manager import get_iso_timestring
+from app.date_manager import get_day_delta, get_iso_timestring, now
 from app.exceptions.base_service_exception import EntityNotFoundException
 from app.repository import Repository
 from app.utils.classes import RoundedDecimal
@@ -532,3 +533,79 @@ async def test_transaction_amount_is_number(
     json_response = res.json()
 
     assert isinstance(json_response["information"]["amount"], float)
+
+
+@pytest.mark.usefixtures("create_transactions")
+async def test_get_transactions_pages(
+    test_wallet: models.Wallet, repository: Repository
+):
+    """
+    Tests that the transaction list can be paged through with cursors.
+
+    Args:
+        test_wallet (fixture): The test wallet.
+        repository (fixture): The repository.
+    """
+
+    params = {
+        "wallet_id": test_wallet.id,
+        "date_start": get_day_delta(now(), -10).isoformat(),
+        "date_end": get_day_delta(now(), 1).isoformat(),
+        "limit": 2,
+    }
+
+    transaction_list = []
+    while True:
+        res = await make_http_request(
+            ENDPOINT,
+            as_user=test_wallet.user,
+            method=RequestMethod.GET,
+            params=params,
+        )
+
+        assert res.status_code == HTTP_200_OK
+
+        json_response = res.json()
+        assert len(json_response["transactions"]) <= params["limit"]
+        transaction_list.extend(json_response["transactions"])
+
+        if json_response["next_cursor"] is None:
+            break
+
+        params["cursor"] = json_response["next_cursor"]
+
+    expected_list = await repository.filter_by(
+        models.Transaction, models.Transaction.wallet_id, test_wallet.id
+    )
+    id_list = [transaction["id"] for transaction in transaction_list]
+    sort_keys = [
+        (transaction["information"]["date"], transaction["id"])
+        for transaction in transaction_list
+    ]
+
+    assert len(id_list) == len(set(id_list))
+    assert sorted(id_list) == sorted(transaction.id for transaction in expected_list)
+    assert sort_keys == sorted(sort_keys, key=lambda key: key[0], reverse=True)
+
+
+async def test_get_transactions_invalid_cursor(test_wallet: models.Wallet):
+    """
+    Tests that a malformed cursor is rejected.
+
+    Args:
+        test_wallet (fixture): The test wallet.
+    """
+
+    res = await make_http_request(
+        ENDPOINT,
+        as_user=test_wallet.user,
+        method=RequestMethod.GET,
+        params={
+            "wallet_id": test_wallet.id,
+            "date_start": get_day_delta(now(), -10).isoformat(),
+            "date_end": get_iso_timestring(),
+            "cursor": "not-a-cursor",
+        },
+    )
+
+    assert res.status_code == HTTP_400_BAD_REQUEST
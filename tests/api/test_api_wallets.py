@@ -288,6 +288,75 @@ async def test_import_transaction(
     assert new_balance == wallet_refresh.balance
 
 
+async def test_import_transaction_bulk(
+    test_wallet: models.Wallet,
+    test_user: models.User,
+    tmp_path: Path,
+    repository: Repository,
+):
+    """
+    Test case for importing a file with many rows and invalid rows in between.
+
+    Args:
+        test_wallet (fixture): The wallet to import transactions into.
+        test_user (fixture): The user performing the import.
+        tmp_path: Path to a temporary directory for file operations.
+        repository (fixture): The repository for database operations.
+    """
+
+    wallet_id = test_wallet.id
+    reference = "Bulk import"
+    category_list = [
+        await repository.get(models.TransactionCategory, category_id)
+        for category_id in (1, 4)
+    ]
+
+    transactions = [
+        ImportedTransaction(
+            "08.03.2024",
+            reference,
+            -1.5 if idx % 2 else 2.25,
+            category_list[idx % 2].section.label,
+            category_list[idx % 2].label,
+        )
+        for idx in range(300)
+    ]
+    csv_obj = TransactionCSV(transactions)
+    total_amount = csv_obj.calculate_total_amount()
+
+    csv_obj.transactions.append(
+        ImportedTransaction("08.03.2024", reference, 5, "unknown", "unknown")
+    )
+
+    csv_file: Path = tmp_path / "transactions.csv"
+    csv_file.write_text(csv_obj.generate_csv_content())
+
+    wallet_balance = test_wallet.balance
+
+    with open(csv_file, "rb") as f:
+        files = {"file": (csv_file.name, f, "text/csv")}
+        response = await make_http_request(
+            url=f"{ENDPOINT}{wallet_id}/import", files=files, as_user=test_user
+        )
+
+    assert response.status_code == HTTP_202_ACCEPTED
+
+    time.sleep(1)
+
+    wallet_refresh = await repository.get(models.Wallet, wallet_id)
+    assert wallet_balance + total_amount == wallet_refresh.balance
+
+    transaction_list = await repository.filter_by(
+        models.Transaction, models.Transaction.wallet_id, wallet_id
+    )
+    imported_transaction_list = [
+        transaction
+        for transaction in transaction_list
+        if transaction.information.reference == reference
+    ]
+    assert len(imported_transaction_list) == 300
+
+
 @pytest.mark.parametrize(
     "date, amount, category_id",
     [
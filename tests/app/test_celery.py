@@ -0,0 +1,34 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from app.celery import AsyncCelery
+
+
+def test_tasks_share_persistent_loop():
+    """
+    Tests that all tasks of a process run on the same event loop, also when
+    they are called from several threads, and that the cleanup runs on it
+    before the loop is closed.
+    """
+
+    async_celery = AsyncCelery("test")
+    loop_list = []
+    cleanup_loop_list = []
+
+    @async_celery.task
+    async def get_loop():
+        await asyncio.sleep(0)
+        return asyncio.get_running_loop()
+
+    async def cleanup():
+        cleanup_loop_list.append(asyncio.get_running_loop())
+
+    loop_list.append(get_loop())
+    with ThreadPoolExecutor(4) as pool:
+        loop_list.extend(pool.map(lambda _: get_loop(), range(4)))
+
+    async_celery.stop_loop(cleanup)
+
+    assert len(set(loop_list)) == 1
+    assert cleanup_loop_list == loop_list[:1]
+    assert loop_list[0].is_closed()
@@ -0,0 +1,100 @@
+from typing import Awaitable, Callable
+
+from sqlalchemy import event, text
+
+from app import models
+from app.database import SessionLocal, engine
+from app.date_manager import get_day_delta, get_today
+from app.repository import Repository
+
+
+async def explain_repository_call(
+    repository_call: Callable[[Repository], Awaitable],
+) -> str:
+    """
+    Runs a repository call and returns the query plans of all statements it executed.
+
+    Sequential scans are disabled for the transaction, so the plans show
+    which index the planner would use once the tables are large, even
+    though the test tables only hold a few rows.
+
+    Args:
+        repository_call: Coroutine function that receives the repository.
+
+    Returns:
+        str: The joined EXPLAIN output of all statements.
+    """
+
+    statement_list = []
+
+    def capture_statement(
+        _conn, _cursor, statement, parameters, _context, _executemany
+    ):  # pylint: disable=too-many-arguments
+        statement_list.append((statement, parameters))
+
+    async with SessionLocal.begin() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture_statement)
+        try:
+            await repository_call(Repository(session))
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture_statement)
+
+        connection = await session.connection()
+        plan_list = []
+        for statement, parameters in statement_list:
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN {statement}", parameters
+            )
+            plan_list.extend(row[0] for row in result)
+
+    return "\n".join(plan_list)
+
+
+async def test_transactions_from_period_uses_wallet_index(test_wallet: models.Wallet):
+    """
+    Tests that the transactions of a period are looked up by the wallet index.
+
+    Args:
+        test_wallet (fixture): The test wallet.
+    """
+
+    today = get_today()
+    plan = await explain_repository_call(
+        lambda repository: repository.get_transactions_from_period(
+            test_wallet.id, get_day_delta(today, -30), today
+        )
+    )
+
+    assert "ix_transactions_wallet_id" in plan
+
+
+async def test_wallets_of_user_use_user_index(test_user: models.User):
+    """
+    Tests that the wallets of a user are looked up by the user index.
+
+    Args:
+        test_user (fixture): The test user.
+    """
+
+    plan = await explain_repository_call(
+        lambda repository: repository.filter_by(
+            models.Wallet, models.Wallet.user_id, test_user.id
+        )
+    )
+
+    assert "ix_wallets_user_id" in plan
+
+
+async def test_due_scheduled_transactions_use_next_run_index():
+    """
+    Tests that due scheduled transactions are found by a range scan on the
+    next run index.
+    """
+
+    plan = await explain_repository_call(
+        lambda repository: repository.get_due_scheduled_transactions(get_today())
+    )
+
+    assert "ix_transactions_scheduled_next_run_at" in plan
@@ -0,0 +1,40 @@
+import asyncio
+
+from app.database import engine
+from app.utils.leader_election import AdvisoryLockLeader
+
+
+async def test_single_leader_with_failover():
+    """
+    Tests that only one candidate leads at a time and that another candidate
+    takes over once the leader stops.
+    """
+
+    leader_list = []
+
+    def start_candidate(name: str) -> asyncio.Task:
+        leader = AdvisoryLockLeader(engine, lock_id=424242, retry_seconds=0.1)
+        return asyncio.create_task(
+            leader.run(
+                lambda: leader_list.append(name),
+                lambda: leader_list.remove(name),
+            )
+        )
+
+    first_task = start_candidate("first")
+    await asyncio.sleep(0.3)
+    second_task = start_candidate("second")
+    await asyncio.sleep(0.3)
+
+    assert leader_list == ["first"]
+
+    first_task.cancel()
+    await asyncio.gather(first_task, return_exceptions=True)
+    await asyncio.sleep(0.3)
+
+    assert leader_list == ["second"]
+
+    second_task.cancel()
+    await asyncio.gather(second_task, return_exceptions=True)
+
+    assert not leader_list
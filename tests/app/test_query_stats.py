@@ -0,0 +1,28 @@
+from sqlalchemy import create_engine, text
+
+from app.utils.query_stats import register_query_stats, track_queries
+
+
+def test_track_queries():
+    """
+    Tests that queries are only counted inside the tracked scope and
+    that repeated statements are reported.
+    """
+
+    engine = create_engine("sqlite://")
+    register_query_stats(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+        with track_queries("test") as query_stats:
+            for value in range(3):
+                connection.execute(text("SELECT :value"), {"value": value})
+            connection.execute(text("SELECT 2"))
+
+        connection.execute(text("SELECT 1"))
+
+    assert query_stats.query_count == 4
+    assert query_stats.db_time > 0
+    assert query_stats.get_repeated_statements(3) == [("SELECT ?", 3)]
+    assert query_stats.get_server_timing().startswith("db;dur=")
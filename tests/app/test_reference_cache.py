@@ -0,0 +1,87 @@
+import asyncio
+
+from app import models
+from app.repository import Repository
+from app.services.category import CategoryService
+from app.utils.query_stats import track_queries
+from app.utils.reference_cache import ReferenceCache
+
+
+async def test_reference_cache_loads_once_until_invalidated():
+    """
+    Tests that concurrent reads share one load and that an invalidation
+    forces the next read to load again.
+    """
+
+    load_list = []
+
+    async def load() -> int:
+        load_list.append(len(load_list))
+        await asyncio.sleep(0.01)
+        return len(load_list)
+
+    cache = ReferenceCache(ttl_seconds=60)
+    cache.register("test", load)
+
+    assert await asyncio.gather(cache.get("test"), cache.get("test")) == [1, 1]
+    assert len(load_list) == 1
+
+    cache.invalidate("test")
+
+    assert await cache.get("test") == 2
+
+
+async def test_reference_cache_discards_load_invalidated_while_running():
+    """
+    Tests that a value loaded before an invalidation is not cached.
+    """
+
+    cache = ReferenceCache(ttl_seconds=60)
+    load_list = []
+
+    async def load() -> int:
+        load_list.append(len(load_list))
+        if len(load_list) == 1:
+            cache.invalidate("test")
+        return len(load_list)
+
+    cache.register("test", load)
+
+    assert await cache.get("test") == 1
+    assert await cache.get("test") == 2
+
+
+async def test_category_lookup_uses_cache(test_user: models.User):
+    """
+    Tests that categories are read from the database only once.
+
+    Args:
+        test_user (fixture): The test user.
+    """
+
+    service = CategoryService(Repository())
+    category_list = await service.get_categories(test_user)
+
+    with track_queries("test") as query_stats:
+        assert await service.get_categories(test_user) == category_list
+        category = await service.get_category(test_user, category_list[0].id)
+
+    assert query_stats.query_count == 0
+    assert category.section.label == category_list[0].section.label
+
+
+async def test_category_choices_are_shared(test_user: models.User):
+    """
+    Tests that the category choices are built once and grouped by section.
+
+    Args:
+        test_user (fixture): The test user.
+    """
+
+    service = CategoryService(Repository())
+    category_choices = await service.get_category_choices(test_user)
+
+    assert await service.get_category_choices(test_user) is category_choices
+    assert sum(len(choices) for choices in category_choices.values()) == len(
+        await service.get_categories(test_user)
+    )
@@ -1,26 +1,37 @@
 import datetime
-import time
 from typing import List
 
 import pytest
 
 from app import models
-from app.date_manager import get_today, get_yesterday
+from app.celery import celery
+from app.database import SessionLocal
+from app.date_manager import get_day_delta, get_today, get_tomorrow, get_yesterday
 from app.repository import Repository
-from app.schemas import TransactionData
+from app.schemas import ScheduledTransactionInformtionUpdate, TransactionData
+from app.services.scheduled_transactions import ScheduledTransactionService
 from app.services.transactions import TransactionService
-from app.tasks import process_scheduled_transactions
+from app.tasks import (
+    SCHEDULED_TRANSACTIONS_JOB,
+    catch_up_missed_scheduled_transactions,
+    process_scheduled_transaction_shard,
+    process_scheduled_transactions,
+    summarize_scheduled_transaction_shards,
+)
 from app.utils.enums import DatabaseFilterOperator, Frequency
 
 
-def _process_scheduled_transactions() -> None:
+def _process_scheduled_transactions(timeout: float = 30) -> None:
     """
-    Process scheduled transactions asynchronously and
-    wait for a short duration for processing to complete.
+    Process scheduled transactions asynchronously and wait until all shards
+    are done and the run is recorded.
+
+    Args:
+        timeout: The maximum number of seconds to wait for each result.
     """
 
-    process_scheduled_transactions.delay()
-    time.sleep(1)  # give it some time to process
+    chord_id = process_scheduled_transactions.delay().get(timeout=timeout)
+    celery.AsyncResult(chord_id).get(timeout=timeout)
 
 
 async def _assert_transaction_creation(
@@ -395,3 +406,229 @@ async def test_scheduled_transaction_yearly_already_exist(
     await _assert_scheduled_transaction_already_exist(
         Frequency.YEARLY, test_wallet, test_user, repository, date
     )
+
+
+@pytest.mark.usefixtures("create_scheduled_transactions")
+async def test_create_scheduled_transactions_once(repository: Repository):
+    """
+    Test that a run advances the next run of all executed scheduled transactions,
+    so a second run on the same day does not create any transaction.
+
+    Args:
+        repository (fixture): The repository for database operations.
+    """
+
+    async def create_scheduled_transactions() -> int:
+        async with SessionLocal.begin() as session:
+            service = TransactionService(Repository(session))
+            return await service.create_scheduled_transactions(get_today())
+
+    assert await create_scheduled_transactions() > 0
+    assert not await repository.get_due_scheduled_transactions(get_today())
+    assert await create_scheduled_transactions() == 0
+
+
+@pytest.mark.usefixtures("create_scheduled_transactions")
+async def test_create_scheduled_transactions_sharded(repository: Repository):
+    """
+    Test that the shards of a run together execute every due scheduled transaction.
+
+    Args:
+        repository (fixture): The repository for database operations.
+    """
+
+    shard_count = 3
+    today = get_today()
+
+    for shard_index in range(shard_count):
+        async with SessionLocal.begin() as session:
+            service = TransactionService(Repository(session))
+            await service.create_scheduled_transactions(
+                today, (shard_index, shard_count)
+            )
+
+    assert not await repository.get_due_scheduled_transactions(today)
+
+
+@pytest.mark.usefixtures("create_scheduled_transactions")
+async def test_update_scheduled_transaction_moves_next_run(
+    test_wallet: models.Wallet, test_user: models.User, repository: Repository
+):
+    """
+    Test that changing the frequency or the start of a scheduled transaction
+    recomputes its next run like a new one, without a second run on a day
+    that already has one.
+
+    Args:
+        test_wallet (fixture): The test wallet for the transaction.
+        test_user (fixture): The test user for the transaction.
+        repository (fixture): The repository for database operations.
+    """
+
+    today = get_today()
+    tomorrow = get_tomorrow(today)
+    model = models.TransactionScheduled
+
+    async def get_daily_scheduled_transaction(
+        date_start: datetime.datetime,
+    ) -> models.TransactionScheduled:
+        scheduled_transaction_list = await repository.filter_by_multiple(
+            model,
+            [
+                (model.wallet_id, test_wallet.id, DatabaseFilterOperator.EQUAL),
+                (
+                    model.frequency_id,
+                    Frequency.DAILY.value,
+                    DatabaseFilterOperator.EQUAL,
+                ),
+                (model.date_start, date_start, DatabaseFilterOperator.EQUAL),
+            ],
+        )
+        return scheduled_transaction_list[0]
+
+    ran_today = await get_daily_scheduled_transaction(today)
+    not_started = await get_daily_scheduled_transaction(tomorrow)
+
+    async with SessionLocal.begin() as session:
+        await TransactionService(Repository(session)).create_scheduled_transactions(
+            today
+        )
+
+    async def update_scheduled_transaction(
+        scheduled_transaction: models.TransactionScheduled,
+        frequency: Frequency,
+        date_start: datetime.datetime,
+    ) -> datetime.datetime:
+        await ScheduledTransactionService().update_scheduled_transaction(
+            test_user,
+            scheduled_transaction.id,
+            ScheduledTransactionInformtionUpdate(
+                wallet_id=test_wallet.id,
+                amount=scheduled_transaction.information.amount,
+                reference=scheduled_transaction.information.reference,
+                category_id=scheduled_transaction.information.category_id,
+                date_start=date_start,
+                frequency_id=frequency.value,
+                date_end=scheduled_transaction.date_end,
+            ),
+        )
+
+        return (await repository.get(model, scheduled_transaction.id)).next_run_at
+
+    later = get_day_delta(today, 3)
+    yesterday = get_yesterday(today)
+
+    assert (
+        await update_scheduled_transaction(ran_today, Frequency.WEEKLY, yesterday)
+    ).timestamp() == tomorrow.timestamp()
+    assert (
+        await update_scheduled_transaction(ran_today, Frequency.WEEKLY, later)
+    ).timestamp() == later.timestamp()
+    assert (
+        await update_scheduled_transaction(ran_today, Frequency.WEEKLY, today)
+    ).timestamp() == tomorrow.timestamp()
+    assert (
+        await update_scheduled_transaction(not_started, Frequency.DAILY, yesterday)
+    ).timestamp() == today.timestamp()
+
+    due_id_list = [
+        transaction.id
+        for transaction in await repository.get_due_scheduled_transactions(today)
+    ]
+
+    assert ran_today.id not in due_id_list
+    assert not_started.id in due_id_list
+
+
+def test_summarize_scheduled_transaction_shards():
+    """
+    Test that the shard results are summed up and failed shards are reported.
+    """
+
+    summary = summarize_scheduled_transaction_shards.run(
+        [
+            {"shard": 0, "created": 3, "error": None},
+            {"shard": 1, "created": 0, "error": "connection lost"},
+            {"shard": 2, "created": 2, "error": None},
+        ]
+    )
+
+    assert summary == {"created": 5, "failed_shards": [1]}
+
+
+async def test_scheduled_transaction_shard_connection_error(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    Test that a shard losing its database connection is reported as failed
+    instead of failing the run.
+
+    Args:
+        monkeypatch (fixture): Replaces the service method for the test.
+    """
+
+    async def refuse_connection(*_args) -> int:
+        raise ConnectionRefusedError("Connection refused")
+
+    monkeypatch.setattr(
+        TransactionService, "create_scheduled_transactions", refuse_connection
+    )
+
+    shard_result = await process_scheduled_transaction_shard.run(
+        1, 2, get_today().isoformat()
+    )
+
+    assert shard_result == {"shard": 1, "created": 0, "error": "Connection refused"}
+    assert summarize_scheduled_transaction_shards.run(
+        [{"shard": 0, "created": 2, "error": None}, shard_result]
+    ) == {"created": 2, "failed_shards": [1]}
+
+
+@pytest.mark.usefixtures("create_scheduled_transactions")
+async def test_catch_up_missed_scheduled_transactions(
+    test_wallet: models.Wallet, repository: Repository
+):
+    """
+    Test that the catch-up creates every missed run with its historical date
+    and records the watermark.
+
+    Args:
+        test_wallet (fixture): The test wallet for the transaction.
+        repository (fixture): The repository for database operations.
+    """
+
+    today = get_today()
+    missed_days = 3
+    model = models.TransactionScheduled
+
+    scheduled_transaction_list = await repository.filter_by_multiple(
+        model,
+        [
+            (model.wallet_id, test_wallet.id, DatabaseFilterOperator.EQUAL),
+            (model.frequency_id, Frequency.DAILY.value, DatabaseFilterOperator.EQUAL),
+            (model.date_start, today, DatabaseFilterOperator.EQUAL),
+        ],
+    )
+    scheduled_transaction = scheduled_transaction_list[0]
+
+    await repository.update(
+        model,
+        scheduled_transaction.id,
+        next_run_at=today - datetime.timedelta(days=missed_days),
+    )
+
+    assert await catch_up_missed_scheduled_transactions(today) > missed_days
+
+    transaction_list = await repository.filter_by(
+        models.Transaction,
+        models.Transaction.scheduled_transaction_id,
+        scheduled_transaction.id,
+    )
+
+    assert sorted(transaction.information.date for transaction in transaction_list) == [
+        today - datetime.timedelta(days=day) for day in range(missed_days, -1, -1)
+    ]
+    assert not await repository.get_due_scheduled_transactions(today)
+    assert (
+        await repository.get_job_watermark(SCHEDULED_TRANSACTIONS_JOB)
+    ).timestamp() == today.timestamp()
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import pytest
+from bs4 import BeautifulSoup, Tag
+from starlette.status import HTTP_200_OK
+
+from app import models
+from app.config import settings
+from app.schemas import TransactionData
+from app.services.transactions import TransactionService
+from app.utils.enums import RequestMethod
+from tests.utils import make_http_request
+
+
+@pytest.mark.parametrize(
+    "time_zone, day",
+    [(None, 9), ("Europe/Berlin", 10), ("America/New_York", 9)],
+)
+async def test_view_wallet_groups_by_time_zone(
+    test_user: models.User,
+    test_wallet: models.Wallet,
+    time_zone: Optional[str],
+    day: int,
+):
+    """
+    Tests that the wallet page shows a late evening transaction under the
+    calendar day of the time_zone cookie, in UTC without the cookie.
+
+    Args:
+        test_user (fixture): The test user.
+        test_wallet (fixture): The test wallet.
+        time_zone: The time_zone cookie of the request.
+        day: The expected day of the month of the transaction.
+    """
+
+    date = datetime(2024, 3, 9, 23, 30, tzinfo=timezone.utc)
+    reference = f"Late evening - {time_zone}"
+
+    transaction = await TransactionService().create_transaction(
+        test_user,
+        TransactionData(
+            wallet_id=test_wallet.id,
+            amount=10,
+            reference=reference,
+            date=date,
+            category_id=1,
+        ),
+    )
+
+    cookies = {
+        "date_start": (date - timedelta(days=2)).isoformat(),
+        "date_end": (date + timedelta(days=2)).isoformat(),
+    }
+    if time_zone:
+        cookies["time_zone"] = time_zone
+
+    res = await make_http_request(
+        f"/dashboard/wallets/{test_wallet.id}",
+        as_user=test_user,
+        method=RequestMethod.GET,
+        cookies=cookies,
+    )
+
+    assert res.status_code == HTTP_200_OK
+
+    soup = BeautifulSoup(res.text, "html.parser")
+    link = soup.find(
+        "a", href=lambda href: href and href.endswith(f"/transactions/{transaction.id}")
+    )
+    day_label = link.find_parent("div", class_="w-full").span.get_text(strip=True)
+
+    assert day_label == date.replace(day=day).strftime("%A - %d %B")
+
+
+async def test_view_wallet_older_transactions_link(
+    test_user: models.User,
+    test_wallet: models.Wallet,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    Tests that the link to older transactions is only shown if there are
+    days older than the shown ones.
+
+    Args:
+        test_user (fixture): The test user.
+        test_wallet (fixture): The test wallet.
+        monkeypatch (fixture): Lowers the day limit for the test.
+    """
+
+    monkeypatch.setattr(settings, "wallet_feed_day_limit", 2)
+
+    date = datetime(2024, 5, 12, 12, tzinfo=timezone.utc)
+    cookies = {
+        "date_start": datetime(2024, 5, 1, tzinfo=timezone.utc).isoformat(),
+        "date_end": datetime(2024, 5, 31, tzinfo=timezone.utc).isoformat(),
+    }
+
+    async def create_transaction(days: int) -> None:
+        await TransactionService().create_transaction(
+            test_user,
+            TransactionData(
+                wallet_id=test_wallet.id,
+                amount=10,
+                reference=f"Feed day - {days}",
+                date=date - timedelta(days=days),
+                category_id=1,
+            ),
+        )
+
+    async def get_older_link(params: Optional[dict] = None) -> Optional[Tag]:
+        res = await make_http_request(
+            f"/dashboard/wallets/{test_wallet.id}",
+            as_user=test_user,
+            method=RequestMethod.GET,
+            cookies=cookies,
+            params=params,
+        )
+
+        assert res.status_code == HTTP_200_OK
+
+        soup = BeautifulSoup(res.text, "html.parser")
+        return soup.find(
+            "a", string=lambda text: text and "Show older transactions" in text
+        )
+
+    await create_transaction(0)
+    await create_transaction(1)
+
+    assert await get_older_link() is None
+
+    await create_transaction(2)
+    link = await get_older_link()
+
+    assert link is not None
+    assert link["href"].endswith(f"before={(date - timedelta(days=1)).date()}")
+    assert (
+        await get_older_link({"before": (date - timedelta(days=1)).date().isoformat()})
+        is None
+    )